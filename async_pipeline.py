@@ -0,0 +1,136 @@
+import asyncio
+import inspect
+
+
+class Pipeline_Stage:
+    """
+    A single unit of work in an Async_Pipeline.
+
+    Attributes:
+        name (str): Unique name of the stage, used by other stages to declare dependencies.
+        func (callable): The work to run. Blocking callables are executed in a worker thread,
+                         coroutine functions are awaited directly on the event loop.
+        depends_on (tuple): Names of the stages whose results this stage needs.
+    """
+
+    def __init__(self, name: str, func, depends_on=()):
+        """
+        Initialize a pipeline stage.
+
+        Args:
+            name (str): Unique name of the stage.
+            func (callable): Callable receiving the results of `depends_on`, in order, as positional arguments.
+            depends_on (iterable): Names of the stages that must finish before this one starts.
+        """
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+
+
+class Async_Pipeline:
+    """
+    Run a set of stages with explicit dependencies on an asyncio event loop.
+
+    Every stage starts as soon as all of its dependencies have finished, so stages that do not
+    depend on each other overlap. Blocking stages run through `asyncio.to_thread` so the event
+    loop itself never blocks.
+
+    Attributes:
+        stages (dict): Mapping of stage name to Pipeline_Stage, in insertion order.
+        results (dict): Mapping of stage name to the value returned by the stage once it has run.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.results = {}
+
+    def add_stage(self, name: str, func, depends_on=()):
+        """
+        Register a stage in the pipeline.
+
+        Args:
+            name (str): Unique name of the stage.
+            func (callable): The work to run for this stage.
+            depends_on (iterable): Names of the stages that must finish first.
+
+        Raises:
+            ValueError: If a stage with the same name is already registered.
+        """
+        if name in self.stages:
+            raise ValueError(f"Stage '{name}' is already registered.")
+        self.stages[name] = Pipeline_Stage(name, func, depends_on)
+
+    def _validate(self):
+        """
+        Check that every dependency exists and that the dependency graph has no cycles.
+
+        Raises:
+            ValueError: If a stage depends on an unknown stage or the stages form a cycle.
+        """
+        for stage in self.stages.values():
+            for dependency in stage.depends_on:
+                if dependency not in self.stages:
+                    raise ValueError(f"Stage '{stage.name}' depends on unknown stage '{dependency}'.")
+
+        visiting, done = set(), set()
+
+        def visit(name):
+            if name in done:
+                return
+            if name in visiting:
+                raise ValueError(f"Dependency cycle detected at stage '{name}'.")
+            visiting.add(name)
+            for dependency in self.stages[name].depends_on:
+                visit(dependency)
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.stages:
+            visit(name)
+
+    async def _run_stage(self, stage, tasks):
+        arguments = []
+        for dependency in stage.depends_on:
+            arguments.append(await tasks[dependency])
+
+        if inspect.iscoroutinefunction(stage.func):
+            result = await stage.func(*arguments)
+        else:
+            result = await asyncio.to_thread(stage.func, *arguments)
+        self.results[stage.name] = result
+        return result
+
+    async def run(self):
+        """
+        Run every registered stage, overlapping stages that do not depend on each other.
+
+        Returns:
+            dict: Mapping of stage name to the value returned by that stage.
+
+        Raises:
+            ValueError: If the dependency graph is invalid.
+            Exception: The first exception raised by a stage; all stages still pending are cancelled.
+        """
+        self._validate()
+        self.results = {}
+        tasks = {}
+        for stage in self.stages.values():
+            tasks[stage.name] = asyncio.ensure_future(self._run_stage(stage, tasks))
+
+        try:
+            await asyncio.gather(*tasks.values())
+        except Exception:
+            for task in tasks.values():
+                task.cancel()
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+            raise
+        return self.results
+
+    def run_sync(self):
+        """
+        Run the pipeline to completion from synchronous code.
+
+        Returns:
+            dict: Mapping of stage name to the value returned by that stage.
+        """
+        return asyncio.run(self.run())
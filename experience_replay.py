@@ -0,0 +1,121 @@
+import numpy as np
+
+
+class Replay_Memory:
+    """
+    Ring buffer of Q-learning transitions, stored in preallocated NumPy arrays.
+
+    A transition moves from `state` to the neighbor `action` (in this routing problem the action is the next
+    node, so the next state equals the action) and collects `reward`; `done` marks transitions into the goal.
+    Once full, the oldest transitions are overwritten.
+
+    With prioritized sampling, transitions are drawn with probability proportional to (|TD error| + epsilon)^alpha
+    and new transitions get the largest priority seen so far, so each is replayed at least about once. Transitions
+    are deterministic here (every (state, action) always has the same reward and next state), so the sampling
+    distribution changes how fast Q converges but not what it converges to, and no importance-sampling
+    correction is needed.
+
+    Attributes:
+        capacity (int): Maximum number of stored transitions.
+        prioritized (bool): Whether sampling is prioritized.
+        states, actions, next_states (np.ndarray): Node indices (int64) per slot.
+        rewards (np.ndarray): Rewards (float64) per slot.
+        dones (np.ndarray): Goal flags (bool) per slot.
+        priorities (np.ndarray): Sampling priorities (float64) per slot.
+        max_priority (float): Largest priority assigned so far, given to new transitions.
+    """
+
+    def __init__(self, capacity=10000, prioritized=False, alpha=0.6, epsilon=1e-3, seed=None):
+        """
+        Args:
+            capacity (int): Maximum number of stored transitions. Default is 10000.
+            prioritized (bool): If True, sample by TD-error priority; otherwise uniformly. Default is False.
+            alpha (float): How strongly priorities skew sampling (0 is uniform). Default is 0.6.
+            epsilon (float): Added to |TD error| so no transition gets zero probability. Default is 1e-3.
+            seed (int): Seed of the sampling generator.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self.prioritized = prioritized
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float64)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.dones = np.zeros(capacity, dtype=bool)
+        self.priorities = np.zeros(capacity, dtype=np.float64)
+        self.max_priority = 1.0
+        self.rng = np.random.default_rng(seed)
+        self.position = 0
+        self.size = 0
+
+    def add(self, state, action, reward, next_state, done):
+        """Store one transition, overwriting the oldest one when the buffer is full."""
+        i = self.position
+        self.states[i] = state
+        self.actions[i] = action
+        self.rewards[i] = reward
+        self.next_states[i] = next_state
+        self.dones[i] = done
+        self.priorities[i] = self.max_priority
+        self.position = (i + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def sample(self, batch_size):
+        """
+        Args:
+            batch_size (int): Number of transitions to draw (with replacement).
+
+        Returns:
+            np.ndarray: Slot indices of the drawn transitions.
+        """
+        if self.prioritized:
+            weights = self.priorities[:self.size] ** self.alpha
+            return self.rng.choice(self.size, batch_size, p=weights / weights.sum())
+        return self.rng.integers(0, self.size, batch_size)
+
+    def update_priorities(self, indices, td_errors):
+        priorities = np.abs(td_errors) + self.epsilon
+        self.priorities[indices] = priorities
+        if len(priorities):
+            self.max_priority = max(self.max_priority, float(priorities.max()))
+
+    def clear(self):
+        """Drop every transition, e.g. when the goal and therefore the rewards change."""
+        self.position = 0
+        self.size = 0
+        self.max_priority = 1.0
+
+    def __len__(self):
+        return self.size
+
+
+def replay_update(Q, memory, batch_size, learning_rate, discount_factor):
+    """
+    Apply one batched Bellman update to Q from transitions sampled out of the replay memory.
+
+    For every sampled transition (s, a, r, s', done):
+        Q[s, a] += learning_rate * (r + discount_factor * max(Q[s']) * (1 - done) - Q[s, a])
+    computed for the whole batch at once. Like `QLearningPathFinder.update_Q`, the maximum runs over the full
+    Q row, so it is floored at 0. A transition drawn several times in one batch is applied once.
+
+    Args:
+        Q (np.ndarray): The Q-table, updated in place.
+        memory (Replay_Memory): The transitions.
+        batch_size (int): Number of transitions per update.
+        learning_rate (float): Learning rate.
+        discount_factor (float): Discount factor.
+
+    Returns:
+        np.ndarray: The TD errors of the sampled transitions (before the update).
+    """
+    indices = memory.sample(batch_size)
+    states, actions = memory.states[indices], memory.actions[indices]
+    future_values = np.where(memory.dones[indices], 0.0, Q[memory.next_states[indices]].max(axis=1))
+    td_errors = memory.rewards[indices] + discount_factor * future_values - Q[states, actions]
+    Q[states, actions] += learning_rate * td_errors
+    if memory.prioritized:
+        memory.update_priorities(indices, td_errors)
+    return td_errors
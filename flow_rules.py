@@ -0,0 +1,562 @@
+from abc import ABC, abstractmethod
+from collections import namedtuple
+import json
+import os
+import tempfile
+import time
+import uuid
+
+OVS_OFCTL = "/usr/bin/ovs-ofctl"
+ARP_MATCH = "dl_type=0x0806"
+# Rules Ofctl_Flow_File_Sink buffers in memory before appending them to the per-switch files
+FLOW_FILE_BUFFER_RULES = 65536
+
+
+class Flow_Rule(namedtuple("Flow_Rule", ["switch", "match", "action"])):
+    """
+    A single OpenFlow rule.
+
+    Attributes:
+        switch (str): Name of the switch the rule is installed on.
+        match (str): The ovs-ofctl match fields, e.g. "in_port=1,dl_type=0x0800,nw_dst=10.0.1.1".
+        action (str): The ovs-ofctl action, e.g. "output:3" or "flood".
+    """
+    __slots__ = ()
+
+    def flow(self):
+        """
+        Returns:
+            str: The rule in ovs-ofctl flow syntax, e.g. "in_port=1,dl_type=0x0800,nw_dst=10.0.1.1,action=output:3".
+        """
+        return f"{self.match},action={self.action}"
+
+    def ofctl_command(self):
+        """
+        Returns:
+            str: The ovs-ofctl command that installs the rule.
+        """
+        return f'{OVS_OFCTL} add-flow {self.switch} "{self.flow()}"'
+
+    def ofctl_modify_command(self):
+        """
+        Returns:
+            str: The ovs-ofctl command that changes the action of the installed rule with the same match.
+        """
+        return f'{OVS_OFCTL} --strict mod-flows {self.switch} "{self.flow()}"'
+
+    def ofctl_delete_command(self):
+        """
+        Returns:
+            str: The ovs-ofctl command that removes the installed rule with the same match.
+        """
+        return f'{OVS_OFCTL} --strict del-flows {self.switch} "{self.match}"'
+
+    def to_dict(self):
+        return {"switch": self.switch, "match": self.match, "action": self.action}
+
+
+def path_flow_rules(network_graph, path):
+    """
+    Generate the forwarding rules along a path.
+
+    For every switch on the path, one rule forwards IPv4 traffic towards the destination host and one
+    forwards the reply traffic back to the source host. ARP is flooded on every switch of the path.
+
+    Args:
+        network_graph (Network_Graph): The graph holding the `topology` index and host `IPs`.
+        path (list): A list of nodes representing the path from source to destination.
+
+    Returns:
+        generator: Yields one Flow_Rule per rule.
+
+    Raises:
+        ValueError: If `path` is empty.
+        AttributeError: If the network graph is not properly initialized.
+    """
+    # Validation runs eagerly; the rules themselves are produced lazily
+    _validate_path(network_graph, path)
+    return _path_flow_rules(network_graph, path)
+
+
+def _validate_path(network_graph, path):
+    if not path:
+        raise ValueError("Path cannot be empty.")
+
+    if not hasattr(network_graph, "topology") or not hasattr(network_graph, "IPs"):
+        raise AttributeError("Network graph is not properly initialized.")
+
+
+def _path_flow_rules(network_graph, path, include_arp=True):
+    topology = network_graph.topology
+    IPs = network_graph.IPs
+    dest_ip = IPs.get(path[-1])
+    source_ip = IPs.get(path[0])
+    # Iterate through the path to generate routing commands
+    for i in range(1, len(path) - 1):
+        node0 = path[i - 1]  # Previous node
+        node1 = path[i]      # Current node
+        node2 = path[i + 1]  # Next node
+        if not topology.is_switch(node1):
+            continue
+
+        # Ports of node1 on the incoming (node0-node1) and outgoing (node1-node2) links
+        in_link = topology.get_link(node0, node1)
+        out_link = topology.get_link(node1, node2)
+        in_port = in_link.port_of(node1) if in_link else None
+        out_port = out_link.port_of(node1) if out_link else None
+        if in_port is not None and out_port is not None:
+            # Route packets to the destination IP, and the replies back to the source IP
+            yield Flow_Rule(node1, f"in_port={in_port},dl_type=0x0800,nw_dst={dest_ip}", f"output:{out_port}")
+            yield Flow_Rule(node1, f"in_port={out_port},dl_type=0x0800,nw_dst={source_ip}", f"output:{in_port}")
+
+    if include_arp:
+        for node in path:
+            if topology.is_switch(node):
+                yield Flow_Rule(node, ARP_MATCH, "flood")
+
+
+def flow_rules_for_paths(network_graph, paths):
+    """
+    Generate the forwarding rules for any number of paths, one path at a time.
+
+    The ARP flood rule is emitted only once per switch, however many paths cross it. Only the set of
+    switches seen so far is kept in memory, never the rules themselves.
+
+    Args:
+        network_graph (Network_Graph): The graph holding the `topology` index and host `IPs`.
+        paths (iterable): Paths (lists of nodes); may itself be a generator.
+
+    Yields:
+        Flow_Rule: The rules of every path, in path order.
+    """
+    arp_switches = set()
+    for path in paths:
+        if not path:
+            continue
+        _validate_path(network_graph, path)
+        yield from _path_flow_rules(network_graph, path, include_arp=False)
+        for node in path:
+            if network_graph.topology.is_switch(node) and node not in arp_switches:
+                arp_switches.add(node)
+                yield Flow_Rule(node, ARP_MATCH, "flood")
+
+
+def path_flow_commands(network_graph, path):
+    """
+    Generate the ovs-ofctl commands that install the forwarding rules along a path.
+
+    Args:
+        network_graph (Network_Graph): The graph holding the `topology` index and host `IPs`.
+        path (list): A list of nodes representing the path from source to destination.
+
+    Returns:
+        generator: Yields one `ovs-ofctl add-flow` command (str) per rule.
+    """
+    return (rule.ofctl_command() for rule in path_flow_rules(network_graph, path))
+
+
+def unique_output_path(output_file):
+    """
+    Derive a file name that no other run will use, e.g. "dijkstra_flow_commands-20250101T120000-4242-1a2b3c.sh".
+
+    Args:
+        output_file (str): The base file name.
+
+    Returns:
+        str: The unique file name, in the same directory and with the same extension.
+    """
+    base, extension = os.path.splitext(output_file)
+    return f"{base}-{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{uuid.uuid4().hex[:6]}{extension}"
+
+
+class _Atomic_File:
+    """
+    A text file that is written under a temporary name and renamed into place on commit.
+
+    Readers never see a partially written file, and concurrent writers of the same target never interleave.
+    """
+
+    def __init__(self, output_file, mode=None):
+        self.output_file = output_file
+        self.mode = mode
+        directory = os.path.dirname(os.path.abspath(output_file))
+        fd, self.temp_file = tempfile.mkstemp(dir=directory, prefix=f".{os.path.basename(output_file)}.", suffix=".tmp")
+        self.file = os.fdopen(fd, "w")
+
+    def write(self, text):
+        self.file.write(text)
+
+    def commit(self):
+        self.file.close()
+        if self.mode is not None:
+            os.chmod(self.temp_file, self.mode)
+        os.replace(self.temp_file, self.output_file)
+
+    def discard(self):
+        self.file.close()
+        if os.path.exists(self.temp_file):
+            os.remove(self.temp_file)
+
+
+class Flow_Rule_Sink(ABC):
+    """
+    Base class of the flow rule consumers.
+
+    Sinks receive rules one at a time through `write` and are finalized by `close`. Used as a context
+    manager, a sink is closed on success and discarded (leaving no partial output) on error.
+    """
+
+    @abstractmethod
+    def write(self, rule):
+        """Consume one Flow_Rule."""
+
+    def close(self):
+        pass
+
+    def discard(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.discard()
+        return False
+
+
+class Memory_Sink(Flow_Rule_Sink):
+    """
+    Collect the rules in a list.
+
+    Attributes:
+        rules (list): The received Flow_Rule objects.
+    """
+
+    def __init__(self):
+        self.rules = []
+
+    def write(self, rule):
+        self.rules.append(rule)
+
+
+class Bash_Script_Sink(Flow_Rule_Sink):
+    """
+    Write the rules as an executable bash script of `ovs-ofctl add-flow` commands.
+
+    Attributes:
+        output_file (str): Path of the script.
+    """
+
+    def __init__(self, output_file, comment=None):
+        """
+        Args:
+            output_file (str): Path of the script; it is replaced atomically on close.
+            comment (str): Optional comment written below the shebang.
+        """
+        self.output_file = output_file
+        self._file = _Atomic_File(output_file, mode=0o755)
+        self._file.write("#!/bin/bash\n\n")
+        if comment:
+            self._file.write(f"# {comment}\n")
+
+    def write(self, rule):
+        self._file.write(f"{rule.ofctl_command()}\n")
+
+    def close(self):
+        self._file.commit()
+
+    def discard(self):
+        self._file.discard()
+
+
+class Ofctl_Flow_File_Sink(Flow_Rule_Sink):
+    """
+    Write one ovs-ofctl flow file per switch, to be installed with `ovs-ofctl add-flows <switch> <file>`.
+
+    Rules are buffered per switch and, every `buffer_rules` rules, appended to per-switch temporary files
+    that are opened one at a time, so memory stays bounded and the number of open files does not grow with
+    the number of switches. On close the temporary files are renamed into place.
+
+    Attributes:
+        output_directory (str): Directory holding the `<switch>.flows` files.
+        buffer_rules (int): Number of rules buffered in memory between flushes.
+        files (dict): Mapping of switch name to the path of its flow file, filled in on close.
+    """
+
+    def __init__(self, output_directory, buffer_rules=FLOW_FILE_BUFFER_RULES):
+        self.output_directory = output_directory
+        self.buffer_rules = buffer_rules
+        self.files = {}
+        self._buffers = {}
+        self._buffered = 0
+        self._temp_files = {}
+        os.makedirs(output_directory, exist_ok=True)
+
+    def write(self, rule):
+        self._buffers.setdefault(rule.switch, []).append(f"{rule.flow()}\n")
+        self._buffered += 1
+        if self._buffered >= self.buffer_rules:
+            self._flush()
+
+    def _flush(self):
+        for switch, lines in self._buffers.items():
+            temp_file = self._temp_files.get(switch)
+            if temp_file is None:
+                fd, temp_file = tempfile.mkstemp(dir=self.output_directory, prefix=f".{switch}.flows.", suffix=".tmp")
+                self._temp_files[switch] = temp_file
+                file = os.fdopen(fd, "w")
+            else:
+                file = open(temp_file, "a")
+            with file:
+                file.writelines(lines)
+        self._buffers = {}
+        self._buffered = 0
+
+    def close(self):
+        self._flush()
+        for switch, temp_file in self._temp_files.items():
+            output_file = os.path.join(self.output_directory, f"{switch}.flows")
+            os.replace(temp_file, output_file)
+            self.files[switch] = output_file
+        self._temp_files = {}
+
+    def discard(self):
+        for temp_file in self._temp_files.values():
+            if os.path.exists(temp_file):
+                os.remove(temp_file)
+        self._temp_files = {}
+        self._buffers = {}
+        self._buffered = 0
+
+
+class JSONL_Sink(Flow_Rule_Sink):
+    """
+    Write one JSON object per rule and line.
+
+    Attributes:
+        output_file (str): Path of the JSONL file.
+    """
+
+    def __init__(self, output_file):
+        self.output_file = output_file
+        self._file = _Atomic_File(output_file)
+
+    def write(self, rule):
+        self._file.write(json.dumps(rule.to_dict()) + "\n")
+
+    def close(self):
+        self._file.commit()
+
+    def discard(self):
+        self._file.discard()
+
+
+def write_rules(rules, *sinks):
+    """
+    Stream rules into one or more sinks, consuming the rules exactly once.
+
+    The sinks are closed when every rule has been written, or discarded if an error occurs.
+
+    Args:
+        rules (iterable): The Flow_Rule objects; may be a generator.
+        *sinks (Flow_Rule_Sink): The consumers.
+
+    Returns:
+        int: The number of rules written.
+    """
+    count = 0
+    try:
+        for rule in rules:
+            for sink in sinks:
+                sink.write(rule)
+            count += 1
+    except BaseException:
+        for sink in sinks:
+            sink.discard()
+        raise
+    for sink in sinks:
+        sink.close()
+    return count
+
+
+def _flow_tables(rules):
+    """Group rules into per-switch tables {switch: {match: action}}; a later rule replaces an earlier one."""
+    tables = {}
+    for rule in rules:
+        tables.setdefault(rule.switch, {})[rule.match] = rule.action
+    return tables
+
+
+class Flow_Table_Diff:
+    """
+    The changes that turn the installed flow tables into a new rule set.
+
+    Rules are identified by switch and match. A match that is installed but no longer wanted is removed,
+    one whose action changed is modified and a new one is added; switches whose rules are unchanged get
+    no commands at all.
+
+    Attributes:
+        removed (list): Flow_Rule objects to delete (with their previously installed action).
+        modified (list): Flow_Rule objects whose installed action is replaced.
+        added (list): Flow_Rule objects to install.
+        tables (dict): The complete per-switch tables once the diff is applied.
+    """
+
+    def __init__(self, installed, desired):
+        """
+        Args:
+            installed (dict): The installed tables, {switch: {match: action}}.
+            desired (dict): The wanted tables, {switch: {match: action}}.
+        """
+        self.removed, self.modified, self.added = [], [], []
+        self.tables = desired
+        for switch in sorted(set(installed) | set(desired)):
+            old, new = installed.get(switch, {}), desired.get(switch, {})
+            for match, action in old.items():
+                if match not in new:
+                    self.removed.append(Flow_Rule(switch, match, action))
+                elif new[match] != action:
+                    self.modified.append(Flow_Rule(switch, match, new[match]))
+            for match, action in new.items():
+                if match not in old:
+                    self.added.append(Flow_Rule(switch, match, action))
+
+    def changed_switches(self):
+        """list: The switches that get at least one command, sorted."""
+        return sorted({rule.switch for rule in self.removed + self.modified + self.added})
+
+    def commands(self):
+        """
+        Generate the shell commands that apply the diff, switch by switch.
+
+        Per switch, the new rules are installed first with a single `ovs-ofctl add-flows` reading them from a
+        here-document, then changed rules are modified and stale rules deleted last, so a rerouted flow
+        never finds a switch without a rule for it.
+
+        Yields:
+            str: One shell command (possibly spanning several lines) at a time.
+        """
+        added = _flow_tables(self.added)
+        for switch in self.changed_switches():
+            if switch in added:
+                flows = "\n".join(f"{match},action={action}" for match, action in added[switch].items())
+                yield f"{OVS_OFCTL} add-flows {switch} - <<'EOF'\n{flows}\nEOF"
+            for rule in self.modified:
+                if rule.switch == switch:
+                    yield rule.ofctl_modify_command()
+            for rule in self.removed:
+                if rule.switch == switch:
+                    yield rule.ofctl_delete_command()
+
+    def __bool__(self):
+        return bool(self.removed or self.modified or self.added)
+
+    def __repr__(self):
+        return (f"Flow_Table_Diff(removed={len(self.removed)}, modified={len(self.modified)}, "
+                f"added={len(self.added)}, switches={self.changed_switches()})")
+
+
+class Flow_Table_State:
+    """
+    The per-switch flow tables last installed on the network, persisted as a JSON file.
+
+    Attributes:
+        state_file (str): Path of the JSON file, {switch: {match: action}}.
+        tables (dict): The installed tables.
+    """
+
+    def __init__(self, state_file="installed_flows.json"):
+        """
+        Args:
+            state_file (str): Path of the JSON file; loaded if it exists. Default is "installed_flows.json".
+        """
+        self.state_file = state_file
+        self.tables = {}
+        if os.path.exists(state_file):
+            with open(state_file) as file:
+                self.tables = json.load(file)
+
+    def diff(self, rules):
+        """
+        Compare the installed tables with a complete new rule set.
+
+        Args:
+            rules (iterable): Every Flow_Rule that should be installed; switches without rules are emptied.
+
+        Returns:
+            Flow_Table_Diff: The changes to apply.
+        """
+        return Flow_Table_Diff(self.tables, _flow_tables(rules))
+
+    def commit(self, diff):
+        """Record the tables left by an applied diff and save them atomically."""
+        self.tables = diff.tables
+        self.save()
+
+    def clear(self):
+        """Forget every installed rule, e.g. when the switches are recreated with empty tables."""
+        self.tables = {}
+        self.save()
+
+    def save(self):
+        file = _Atomic_File(self.state_file)
+        try:
+            json.dump(self.tables, file, indent=2, sort_keys=True)
+        except BaseException:
+            file.discard()
+            raise
+        file.commit()
+
+
+class Flow_Diff_Script_Sink(Flow_Rule_Sink):
+    """
+    Write a bash script that moves the installed flow tables to the received rules with as few commands as possible.
+
+    The received rules are the complete new rule set. On close they are diffed against the installed state
+    (see Flow_Table_Diff), the script is written and the state is committed, so the state always describes
+    the tables the written scripts leave behind.
+
+    Attributes:
+        output_file (str): Path of the script.
+        state (Flow_Table_State): The installed flow tables.
+        diff (Flow_Table_Diff): The applied diff, available once the sink is closed.
+    """
+
+    def __init__(self, output_file, state, comment=None, commit_state=True):
+        """
+        Args:
+            output_file (str): Path of the script; it is replaced atomically on close.
+            state (Flow_Table_State): The installed flow tables.
+            comment (str): Optional comment written below the shebang.
+            commit_state (bool): If False, the state is left unchanged and the caller commits `diff` once the script
+                           has actually run. Default is True.
+        """
+        self.output_file = output_file
+        self.state = state
+        self.comment = comment
+        self.commit_state = commit_state
+        self.diff = None
+        self._rules = Memory_Sink()
+
+    def write(self, rule):
+        self._rules.write(rule)
+
+    def close(self):
+        self.diff = self.state.diff(self._rules.rules)
+        file = _Atomic_File(self.output_file, mode=0o755)
+        try:
+            file.write("#!/bin/bash\n\n")
+            if self.comment:
+                file.write(f"# {self.comment}\n")
+            file.write(f"# Changed switches: {' '.join(self.diff.changed_switches()) or 'none'}\n")
+            for command in self.diff.commands():
+                file.write(f"{command}\n")
+        except BaseException:
+            file.discard()
+            raise
+        file.commit()
+        if self.commit_state:
+            self.state.commit(self.diff)
@@ -0,0 +1,395 @@
+from q_learning import QLearningPathFinder
+from collections import deque
+import networkx as nx
+import numpy as np
+
+# Reward of the step into the goal, as set by QLearningPathFinder.set_goal for a switch goal
+GOAL_REWARD = 1000
+
+
+class _Graph_View:
+    """Minimal stand-in for Network_Graph, so QLearningPathFinder can train over any NetworkX graph."""
+
+    def __init__(self, graph):
+        self.graph = graph
+
+    def get_networkx_graph(self):
+        return self.graph
+
+
+def partition_regions(graph, region_size):
+    """
+    Partition a graph into connected regions of at most `region_size` nodes.
+
+    Regions are grown breadth-first from a seed over the nodes that are not assigned yet, so every region is
+    connected and never spans two connected components. Seeds are taken lowest degree first, which starts
+    regions at the fabric's edge and leaves fewer small fragments behind.
+
+    Args:
+        graph (nx.Graph): The graph to partition.
+        region_size (int): Maximum number of nodes per region.
+
+    Returns:
+        list: Regions, each a list of nodes in BFS order.
+
+    Raises:
+        ValueError: If `region_size` is smaller than 1.
+    """
+    if region_size < 1:
+        raise ValueError("region_size must be at least 1.")
+    assigned = set()
+    regions = []
+    for seed in sorted(graph.nodes, key=graph.degree):
+        if seed in assigned:
+            continue
+        region = [seed]
+        assigned.add(seed)
+        queue = deque([seed])
+        while queue and len(region) < region_size:
+            node = queue.popleft()
+            for neighbor in graph[node]:
+                if neighbor not in assigned and len(region) < region_size:
+                    assigned.add(neighbor)
+                    region.append(neighbor)
+                    queue.append(neighbor)
+        regions.append(region)
+    return regions
+
+
+def _erase_loops(path):
+    """Cut the cycles out of a path, keeping the first visit of every node."""
+    result, position = [], {}
+    for node in path:
+        if node in position:
+            for removed in result[position[node] + 1:]:
+                del position[removed]
+            del result[position[node] + 1:]
+        else:
+            position[node] = len(result)
+            result.append(node)
+    return result
+
+
+class HierarchicalQLearningPathFinder:
+    """
+    Q-learning routing over a region hierarchy, for fabrics too large for one flat Q-table.
+
+    Switches are partitioned into connected regions (`partition_regions`) and hosts are mapped to the switch
+    they are attached to, as with `QLearningPathFinder(switches_only=True)`. Training then works on two levels:
+        - every region gets its own small QLearningPathFinder, trained towards each of its border switches
+          (switches with a link into another region); only the resulting node values V = max(0, max Q row)
+          are kept, one array of region size per border switch.
+        - the border graph links the border switches through the physical inter-region links and through one
+          aggregated edge per pair of border switches of a region, standing for the learned intra-region path.
+          Aggregated edges carry the total delay and the bottleneck bandwidth of that path, so their reward is
+          that of a single link with these attributes; summing the per-hop rewards would favor long paths.
+    For a destination, the destination region is trained towards it and the border graph, extended by the
+    destination, gets its own Q-table. A query leaves the source region through the border switch with the
+    best reward plus border-level value, and the border-level path is expanded back into switch hops.
+
+    Memory is bounded by the region size: a region's Q-table holds region_size^2 entries, the border-level
+    table border_count^2, and no table ever covers the whole fabric.
+
+    Attributes:
+        full_graph (nx.Graph): The complete network graph.
+        graph (nx.Graph): The switch subgraph.
+        host_to_switch (dict): Mapping of host to the switch it is attached to.
+        regions (list): Lists of switches, one per region.
+        region_of (dict): Mapping of switch to region index.
+        border_nodes (list): Set of border switches per region index.
+        border_graph (nx.Graph): The border-level graph, built by `train`.
+    """
+
+    def __init__(self, network_graph, region_size=64, verbose=True):
+        """
+        Args:
+            network_graph (Network_Graph): The network to route over.
+            region_size (int): Maximum number of switches per region. Default is 64.
+            verbose (bool): If False, partitioning and training do not print progress messages. The per-region
+                            and border-level finders never print. Default is True.
+        """
+        self.verbose = verbose
+        self.full_graph = network_graph.get_networkx_graph()
+        topology = network_graph.topology
+        self.host_to_switch = {}
+        for host in topology.hosts():
+            switches = [n for n in self.full_graph[host] if topology.is_switch(n)]
+            if switches:
+                self.host_to_switch[host] = switches[0]
+        self.graph = self.full_graph.subgraph(topology.switches())
+        self.region_size = region_size
+
+        self.regions = partition_regions(self.graph, region_size)
+        self.region_of = {node: r for r, region in enumerate(self.regions) for node in region}
+        self.border_nodes = [set() for _ in self.regions]
+        for u, v in self.graph.edges:
+            if self.region_of[u] != self.region_of[v]:
+                self.border_nodes[self.region_of[u]].add(u)
+                self.border_nodes[self.region_of[v]].add(v)
+        if self.verbose:
+            print(f"Partitioned {len(self.graph)} switches into {len(self.regions)} regions "
+                  f"({sum(len(b) for b in self.border_nodes)} border switches)")
+
+        self.region_finders = [None] * len(self.regions)
+        self.border_values = {}  # border switch -> node values of its region towards it
+        self.goal_values = None
+        self.border_graph = None
+        self.training = None
+        self.goal_node = None
+        self._goal_finder = None
+
+    def _region_finder(self, r):
+        if self.region_finders[r] is None:
+            finder = QLearningPathFinder(_Graph_View(self.graph.subgraph(self.regions[r])), verbose=False)
+            # Goal-independent reward of every CSR edge, used to rebuild Q-values from node values
+            finder.edge_rewards = np.array([QLearningPathFinder._edge_reward(finder.graph[finder.index_to_node[i]][
+                finder.index_to_node[j]]) for i, j in zip(finder.edge_src, finder.edge_dst)], dtype=float)
+            self.region_finders[r] = finder
+        return self.region_finders[r]
+
+    @staticmethod
+    def _train_finder(finder, goal, starts, training):
+        """
+        Train a finder's Q-table towards `goal` from scratch, by planning or by episodes spread over the starts.
+        """
+        if training["solver"] == "plan":
+            return finder.plan(goal, training["discount_factor"])
+        finder.Q[:] = 0
+        starts = [start for start in starts if start != goal]
+        episodes = max(1, training["episodes"] // max(len(starts), 1))
+        exploration_rate = training["exploration_rate"]
+        for start in starts:
+            exploration_rate = finder.learn(start, goal, exploration_rate, training["learning_rate"],
+                                            training["discount_factor"], episodes, backend="compiled")
+        return exploration_rate
+
+    @staticmethod
+    def _node_values(finder, goal):
+        """The node values V = max(0, max Q row) of a finder trained towards `goal`, with V = 0 at the goal."""
+        values = np.maximum(finder.Q.max(axis=1), 0.0)
+        values[finder.node_to_index[goal]] = 0.0
+        return values
+
+    def _walk(self, values, start, goal):
+        """
+        Greedy path from start to goal inside the region of `goal`, like `QLearningPathFinder.shortest_path`.
+
+        Every step takes the neighbor not yet on the path with the highest Q-value, rebuilt from the node values
+        as Q[i, j] = R[i, j] + discount_factor * V[j].
+
+        Returns:
+            list: The path, or None if the walk gets stuck.
+        """
+        finder = self._region_finder(self.region_of[goal])
+        if start not in finder.node_to_index:
+            return None
+        discount_factor = self.training["discount_factor"]
+        goal_index = finder.node_to_index[goal]
+        path = [start]
+        seen = {finder.node_to_index[start]}
+        while path[-1] != goal:
+            i = finder.node_to_index[path[-1]]
+            best, best_q = None, -float('inf')
+            for k in range(finder.indptr[i], finder.indptr[i + 1]):
+                j = int(finder.edge_dst[k])
+                if j in seen:
+                    continue
+                q = (GOAL_REWARD if j == goal_index else finder.edge_rewards[k]) + discount_factor * values[j]
+                if q > best_q:
+                    best, best_q = j, q
+            if best is None:
+                return None
+            path.append(finder.index_to_node[best])
+            seen.add(best)
+        return path
+
+    def _path_edge(self, path):
+        """Edge attributes of an aggregated edge standing for `path`."""
+        hops = [self.graph[u][v] for u, v in zip(path[:-1], path[1:])]
+        return {
+            "delay": sum(data['delay'] for data in hops),
+            "bandwidth": min(data['bandwidth'] for data in hops),
+            "path": path,
+        }
+
+    def train(self, solver="plan", exploration_rate=1.0, learning_rate=0.6, discount_factor=0.9, episodes=2000):
+        """
+        Train the intra-region tables towards every border switch and build the border graph.
+
+        Args:
+            solver (str): "plan" plans each table (`QLearningPathFinder.plan`); "learn" trains each table
+                          with `episodes` episodes, spread evenly over the switches of the region as starts.
+            exploration_rate, learning_rate, discount_factor: Q-learning parameters.
+            episodes (int): Episodes per table with the "learn" solver. Default is 2000.
+
+        Raises:
+            ValueError: If `solver` is unknown.
+        """
+        if solver not in ("plan", "learn"):
+            raise ValueError(f"Unknown solver '{solver}'.")
+        self.training = {"solver": solver, "exploration_rate": exploration_rate, "learning_rate": learning_rate,
+                         "discount_factor": discount_factor, "episodes": episodes}
+        self.border_graph = nx.Graph()
+        self.border_values = {}
+        self.goal_node = None
+
+        for r, borders in enumerate(self.border_nodes):
+            finder = self._region_finder(r)
+            for border in borders:
+                self._train_finder(finder, border, self.regions[r], self.training)
+                self.border_values[border] = self._node_values(finder, border)
+            # One aggregated edge per border pair, from the lower-sorted border's point of view
+            for b1 in borders:
+                self.border_graph.add_node(b1)
+                for b2 in borders:
+                    if b1 < b2:
+                        path = self._walk(self.border_values[b2], b1, b2)
+                        if path is not None:
+                            self.border_graph.add_edge(b1, b2, **self._path_edge(path))
+
+        for u, v in self.graph.edges:
+            if self.region_of[u] != self.region_of[v]:
+                self.border_graph.add_edge(u, v, **self._path_edge([u, v]))
+        if self.verbose:
+            print(f"Trained {len(self.border_values)} border tables; border graph has "
+                  f"{self.border_graph.number_of_nodes()} nodes and {self.border_graph.number_of_edges()} edges")
+
+    def _prepare_goal(self, end, training, starts=()):
+        """
+        Train the destination region towards `end` and the border-level table of the extended border graph.
+
+        Returns:
+            The planning sweeps or final exploration rate of the border-level training, or None if the goal
+            region is not connected to any other region.
+        """
+        goal = self.host_to_switch.get(end, end)
+        if goal not in self.region_of:
+            raise ValueError(f"Unknown goal node '{end}'.")
+        r = self.region_of[goal]
+        finder = self._region_finder(r)
+        self._train_finder(finder, goal, self.regions[r], training)
+        self.goal_values = self._node_values(finder, goal)
+        self.goal_node = goal
+
+        goal_graph = self.border_graph.copy()
+        for border in self.border_nodes[r]:
+            if border != goal:
+                path = self._walk(self.goal_values, border, goal)
+                if path is not None:
+                    goal_graph.add_edge(border, goal, **self._path_edge(path))
+        if goal not in goal_graph or goal_graph.degree(goal) == 0:
+            self._goal_finder = None
+            return None
+
+        self._goal_finder = QLearningPathFinder(_Graph_View(goal_graph), verbose=False)
+        border_starts = [b for start in starts for b in self.border_nodes[self.region_of.get(start, r)]]
+        return self._train_finder(self._goal_finder, goal, border_starts or list(goal_graph.nodes), training)
+
+    def plan(self, end, discount_factor=0.9):
+        """
+        Plan every table needed to route to `end` (see `QLearningPathFinder.plan`).
+
+        Returns:
+            int: The sweeps of the border-level planning (0 if the goal region has no border).
+        """
+        if self.training is None or self.training["solver"] != "plan" or \
+                self.training["discount_factor"] != discount_factor:
+            self.train("plan", discount_factor=discount_factor)
+        return self._prepare_goal(end, self.training) or 0
+
+    def learn(self, start, end, exploration_rate, learning_rate, discount_factor, episodes):
+        """
+        Learn every table needed to route from `start` to `end` with sampled episodes.
+
+        Every table (each region towards each of its border switches, then the destination region and the
+        border level) is trained with `episodes` episodes; the border-level episodes start from the border
+        switches of the source region.
+
+        Returns:
+            float: The exploration rate after the last border-level episode.
+        """
+        training = {"solver": "learn", "exploration_rate": exploration_rate, "learning_rate": learning_rate,
+                    "discount_factor": discount_factor, "episodes": episodes}
+        if self.training != training:
+            self.train("learn", exploration_rate, learning_rate, discount_factor, episodes)
+        source = self.host_to_switch.get(start, start)
+        result = self._prepare_goal(end, training, starts=[source])
+        return exploration_rate if result is None else result
+
+    def shortest_path(self, start, end, verbose=True):
+        """
+        Compose the best path from the region tables and the border-level table.
+
+        The tables are planned on demand when `end` is not the goal they were trained for.
+        """
+        if start not in self.full_graph or end not in self.full_graph:
+            return "Invalid nodes"
+        source, goal = self.host_to_switch.get(start, start), self.host_to_switch.get(end, end)
+        if source not in self.region_of or goal not in self.region_of:
+            return "Invalid nodes"
+        if self.goal_node != goal:
+            self.plan(end)
+
+        path = None
+        if self.region_of[source] == self.region_of[goal]:
+            path = self._walk(self.goal_values, source, goal)
+        if path is None:
+            # Different regions, or the walk inside the shared region got stuck: route through the border graph
+            path = self._compose(source, goal)
+        if path is None:
+            if verbose:
+                print(f"No valid path found from {start} to {end}.")
+            return "No valid path found"
+
+        path = _erase_loops(path)
+        if start != source:
+            path.insert(0, start)
+        if end != goal:
+            path.append(end)
+        if verbose:
+            print(f"Final path: {path}")
+        return path
+
+    def _compose(self, source, goal):
+        """
+        Route from `source` through the border graph to `goal`.
+
+        The source region is left through the border switch with the best reward plus border-level value;
+        if the greedy border-level walk gets stuck from there, the next best border switch is tried.
+        """
+        finder = self._goal_finder
+        if finder is None:
+            return None
+        discount_factor = self.training["discount_factor"]
+
+        def value(border):
+            return 0.0 if border == goal else max(0.0, float(finder.Q[finder.node_to_index[border]].max()))
+
+        if source in finder.node_to_index:
+            entries = [[source]]
+        else:
+            scored = []
+            for border in self.border_nodes[self.region_of[source]]:
+                path = self._walk(self.border_values[border], source, border)
+                if path is not None and border in finder.node_to_index:
+                    score = QLearningPathFinder._edge_reward(self._path_edge(path)) + discount_factor * value(border)
+                    scored.append((score, path))
+            scored.sort(key=lambda item: -item[0])
+            entries = [path for _, path in scored]
+
+        for entry in entries:
+            border_path = finder.shortest_path(entry[-1], goal, verbose=False)
+            if isinstance(border_path, list):
+                path = list(entry)
+                for u, v in zip(border_path[:-1], border_path[1:]):
+                    hops = finder.graph[u][v]["path"]
+                    path.extend(hops[1:] if hops[0] == u else hops[-2::-1])
+                return path
+        return None
+
+    def evaluate_path(self, path):
+        if len(path) < 2:
+            return 0, 0
+        total_delay = sum(self.full_graph[u][v]['delay'] for u, v in zip(path[:-1], path[1:]))
+        min_bandwidth = min(self.full_graph[u][v]['bandwidth'] for u, v in zip(path[:-1], path[1:]))
+        return total_delay, min_bandwidth
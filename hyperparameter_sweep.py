@@ -0,0 +1,210 @@
+from networkx_graph import Network_Graph
+from q_learning import QLearningPathFinder
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+import contextlib
+import csv
+import io
+import itertools
+import math
+import random
+import networkx as nx
+
+RESULT_FIELDS = ["rank", "exploration_rate", "learning_rate", "discount_factor", "episodes_trained",
+                 "pruned_at_rung", "path_cost_gap", "q_learning_delay", "dijkstra_delay",
+                 "episodes_to_convergence", "path"]
+
+# Topology loaded once per worker process, keyed by CSV path
+_worker_graphs = {}
+
+
+def grid_configurations(exploration_rates=(1.0,), learning_rates=(0.2, 0.4, 0.6, 0.8),
+                        discount_factors=(0.5, 0.7, 0.9, 0.99)):
+    """
+    Build every combination of the given hyperparameter values.
+
+    Returns:
+        list: Configuration dicts with "exploration_rate", "learning_rate" and "discount_factor".
+    """
+    return [{"exploration_rate": e, "learning_rate": l, "discount_factor": d}
+            for e, l, d in itertools.product(exploration_rates, learning_rates, discount_factors)]
+
+
+def random_configurations(count, exploration_range=(0.5, 1.0), learning_range=(0.05, 1.0),
+                          discount_range=(0.5, 0.99), seed=None):
+    """
+    Draw hyperparameter configurations uniformly at random from the given ranges.
+
+    Args:
+        count (int): Number of configurations.
+        exploration_range, learning_range, discount_range (tuple): (low, high) bounds of each hyperparameter.
+        seed (int): Seed for reproducible draws.
+
+    Returns:
+        list: Configuration dicts with "exploration_rate", "learning_rate" and "discount_factor".
+    """
+    rng = random.Random(seed)
+    return [{"exploration_rate": round(rng.uniform(*exploration_range), 4),
+             "learning_rate": round(rng.uniform(*learning_range), 4),
+             "discount_factor": round(rng.uniform(*discount_range), 4)} for _ in range(count)]
+
+
+def _path_delay(graph, path):
+    if not isinstance(path, list):
+        return None
+    return sum(graph[u][v]['delay'] for u, v in zip(path[:-1], path[1:]))
+
+
+def _train_rung(task):
+    """
+    Continue training one configuration up to the rung's episode budget (runs in a worker process).
+
+    Training happens in chunks of `check_interval` episodes; after every chunk the greedy path is extracted
+    to detect when it stopped changing.
+
+    Args:
+        task (dict): The configuration, its training state from the previous rung and the rung budget.
+
+    Returns:
+        dict: The updated training state.
+    """
+    csv_file = task["csv_file"]
+    if csv_file not in _worker_graphs:
+        _worker_graphs[csv_file] = Network_Graph(csv_file)
+    config, state = task["config"], dict(task["state"])
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        finder = QLearningPathFinder(_worker_graphs[csv_file])
+        if state["Q"] is not None:
+            finder.Q = state["Q"]
+        finder.set_goal(task["dest"])
+        while state["episodes"] < task["budget"]:
+            chunk = min(task["check_interval"], task["budget"] - state["episodes"])
+            state["exploration_rate"] = finder.learn(
+                task["source"], task["dest"], state["exploration_rate"], config["learning_rate"],
+                config["discount_factor"], chunk, backend="compiled", seed=task["seed"] + state["episodes"])
+            state["episodes"] += chunk
+
+            path = finder.shortest_path(task["source"], task["dest"], verbose=False)
+            if not isinstance(path, list) or path != state["path"]:
+                state["stable_since"] = state["episodes"] if isinstance(path, list) else None
+            state["path"] = path
+
+    state["Q"] = finder.Q
+    state["q_learning_delay"] = _path_delay(finder.graph, state["path"])
+    return state
+
+
+def _score(result, dijkstra_delay):
+    """Relative path-cost gap to Dijkstra; infinite when no valid path was learned."""
+    if result["q_learning_delay"] is None:
+        return math.inf
+    return (result["q_learning_delay"] - dijkstra_delay) / dijkstra_delay if dijkstra_delay else 0.0
+
+
+def run_sweep(csv_file, source, dest, configurations, max_episodes=20000, min_episodes=500, reduction_factor=3,
+              check_interval=250, workers=None, seed=0, output_file="hyperparameter_sweep_results.csv"):
+    """
+    Evaluate Q-learning hyperparameters with successive halving in parallel worker processes.
+
+    Every configuration first trains `min_episodes` episodes. After each rung, configurations are ranked by
+    their path-cost gap to Dijkstra (delay-weighted), then by episodes to convergence, and only the best
+    1/`reduction_factor` continue with `reduction_factor` times the episode budget, up to `max_episodes`.
+    Training resumes from the previous rung's Q-table and exploration rate, so no episode is repeated.
+
+    Args:
+        csv_file (str): Path to the topology CSV file, shared by all workers.
+        source (str): The source node.
+        dest (str): The destination node.
+        configurations (list): Configuration dicts, see `grid_configurations` / `random_configurations`.
+        max_episodes (int): Episode budget of the last rung. Default is 20000.
+        min_episodes (int): Episode budget of the first rung. Default is 500.
+        reduction_factor (int): Fraction of configurations kept, and budget growth, per rung. Default is 3.
+        check_interval (int): Episodes between greedy-path checks for convergence. Default is 250.
+        workers (int): Number of worker processes. Default is the number of CPUs.
+        seed (int): Base seed; configuration i trains with seed + 1000003 * i. Default is 0.
+        output_file (str): CSV file receiving the ranked results; None to skip writing. Default is
+                           "hyperparameter_sweep_results.csv".
+
+    Returns:
+        list: Result dicts with the RESULT_FIELDS keys, best first.
+    """
+    graph = Network_Graph(csv_file).get_networkx_graph()
+    try:
+        dijkstra_delay = _path_delay(graph, nx.dijkstra_path(graph, source, dest, weight='delay'))
+    except nx.NetworkXNoPath:
+        raise ValueError(f"No path between {source} and {dest}.")
+
+    states = [{"Q": None, "episodes": 0, "exploration_rate": config["exploration_rate"], "path": None,
+               "stable_since": None, "q_learning_delay": None, "pruned_at_rung": None}
+              for config in configurations]
+    active = list(range(len(configurations)))
+    budget, rung = min(min_episodes, max_episodes), 0
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while active:
+            tasks = [{"csv_file": csv_file, "source": source, "dest": dest, "config": configurations[i],
+                      "state": states[i], "budget": budget, "check_interval": check_interval,
+                      "seed": seed + 1000003 * i} for i in active]
+            for i, state in zip(active, executor.map(_train_rung, tasks)):
+                states[i] = state
+
+            active.sort(key=lambda i: (_score(states[i], dijkstra_delay),
+                                       states[i]["stable_since"] if states[i]["stable_since"] is not None else math.inf))
+            if budget >= max_episodes:
+                break
+            keep = max(1, math.ceil(len(active) / reduction_factor))
+            for i in active[keep:]:
+                states[i]["pruned_at_rung"] = rung
+                states[i]["Q"] = None  # Free the memory of pruned configurations
+            active = active[:keep]
+            budget, rung = min(budget * reduction_factor, max_episodes), rung + 1
+
+    results = []
+    for i, (config, state) in enumerate(zip(configurations, states)):
+        results.append({
+            "exploration_rate": config["exploration_rate"],
+            "learning_rate": config["learning_rate"],
+            "discount_factor": config["discount_factor"],
+            "episodes_trained": state["episodes"],
+            "pruned_at_rung": state["pruned_at_rung"],
+            "path_cost_gap": _score(state, dijkstra_delay),
+            "q_learning_delay": state["q_learning_delay"],
+            "dijkstra_delay": dijkstra_delay,
+            "episodes_to_convergence": state["stable_since"],
+            "path": " ".join(state["path"]) if isinstance(state["path"], list) else state["path"],
+        })
+
+    # Survivors of later rungs first, then by gap and by how fast the greedy path settled
+    results.sort(key=lambda r: (-r["episodes_trained"], r["path_cost_gap"],
+                                r["episodes_to_convergence"] if r["episodes_to_convergence"] is not None else math.inf))
+    for rank, result in enumerate(results, start=1):
+        result["rank"] = rank
+
+    if output_file is not None:
+        with open(output_file, "w", newline="") as csvfile:
+            writer = csv.DictWriter(csvfile, fieldnames=RESULT_FIELDS)
+            writer.writeheader()
+            writer.writerows(results)
+        print(f"Sweep results written to {output_file}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parallel Q-learning hyperparameter sweep with early pruning.")
+    parser.add_argument("--topology", default="network_topology.csv", help="topology CSV file")
+    parser.add_argument("--source", required=True)
+    parser.add_argument("--dest", required=True)
+    parser.add_argument("--random", type=int, help="number of random configurations instead of the default grid")
+    parser.add_argument("--max-episodes", type=int, default=20000)
+    parser.add_argument("--min-episodes", type=int, default=500)
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="hyperparameter_sweep_results.csv")
+    args = parser.parse_args()
+
+    configurations = random_configurations(args.random, seed=args.seed) if args.random else grid_configurations()
+    results = run_sweep(args.topology, args.source, args.dest, configurations, args.max_episodes,
+                        args.min_episodes, workers=args.workers, seed=args.seed, output_file=args.output)
+    for result in results[:5]:
+        print(result)
@@ -0,0 +1,294 @@
+import heapq
+import math
+import numpy as np
+
+NO_PATH = "No path found between the given nodes"
+
+
+class ALT_Path_Finder:
+    """
+    Point-to-point shortest paths with A*, landmarks and the triangle inequality (ALT).
+
+    Preprocessing runs one Dijkstra per landmark and keeps the distance of every node to every landmark.
+    For any landmark L, |d(L, t) - d(L, v)| is a lower bound of d(v, t), so the maximum over the landmarks
+    is an admissible and consistent A* heuristic. Queries search the numeric CSR adjacency, by default from
+    both ends at once with the average potential p(v) = (h_t(v) - h_s(v)) / 2, which keeps the forward and
+    backward searches consistent with each other.
+
+    Paths have the same cost as `nx.dijkstra_path` over the same weights; when several shortest paths exist,
+    either one may be returned.
+
+    Attributes:
+        weight (str): Edge attribute used as length, or None for hop count (edges without it count as 1,
+                      as in NetworkX).
+        nodes (list): Node name per index.
+        node_index (dict): Mapping of node name to index.
+        indptr, indices, lengths (np.ndarray): The CSR adjacency: the neighbors of node i are
+                                               indices[indptr[i]:indptr[i + 1]] at the given lengths.
+        landmarks (list): Indices of the landmark nodes.
+        landmark_distances (np.ndarray): Distance of every node to every landmark, num_nodes x num_landmarks
+                                         (inf for nodes in another component).
+        last_expansions (int): Number of nodes expanded by the last query, for benchmarking.
+    """
+
+    def __init__(self, network_graph, weight=None, landmark_count=8):
+        """
+        Args:
+            network_graph (Network_Graph): The network to route over.
+            weight (str): Edge attribute used as length, e.g. "delay". Default is None (hop count), which is
+                          what `Network_Graph.dijkstra_path_findings` uses.
+            landmark_count (int): Number of landmarks. Default is 8.
+        """
+        graph = network_graph.get_networkx_graph()
+        self.weight = weight
+        self.nodes = list(graph.nodes)
+        self.node_index = {node: i for i, node in enumerate(self.nodes)}
+        degrees = [len(graph[node]) for node in self.nodes]
+        self.indptr = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum(degrees)
+        self.indices = np.array([self.node_index[neighbor] for node in self.nodes for neighbor in graph[node]],
+                                dtype=np.int64)
+        self.lengths = np.array([1.0 if weight is None else float(data.get(weight, 1))
+                                 for node in self.nodes for data in graph[node].values()], dtype=float)
+        if len(self.lengths) and self.lengths.min() < 0:
+            raise ValueError("ALT search needs non-negative edge lengths.")
+        # Plain lists are much faster than NumPy scalars inside the search loops
+        self._adjacency = [list(zip(self.indices[self.indptr[i]:self.indptr[i + 1]].tolist(),
+                                    self.lengths[self.indptr[i]:self.indptr[i + 1]].tolist()))
+                           for i in range(len(self.nodes))]
+        self.last_expansions = 0
+        self.select_landmarks(landmark_count)
+
+    def _dijkstra(self, source):
+        """Distances from `source` to every node (inf when unreachable)."""
+        distances = [math.inf] * len(self.nodes)
+        distances[source] = 0.0
+        heap = [(0.0, source)]
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if distance > distances[node]:
+                continue
+            for neighbor, length in self._adjacency[node]:
+                candidate = distance + length
+                if candidate < distances[neighbor]:
+                    distances[neighbor] = candidate
+                    heapq.heappush(heap, (candidate, neighbor))
+        return np.array(distances)
+
+    def select_landmarks(self, landmark_count):
+        """
+        Choose landmarks by farthest-point selection and compute their distance arrays.
+
+        The first landmark is the node farthest from node 0, every next one the node farthest from all
+        landmarks chosen so far. Nodes not reached by any landmark yet (another connected component) are
+        preferred, so each component gets landmarks of its own.
+
+        Args:
+            landmark_count (int): Number of landmarks, capped at the number of nodes.
+        """
+        self.landmarks = []
+        columns = []
+        if self.nodes:
+            closest = self._dijkstra(0)
+            for _ in range(min(landmark_count, len(self.nodes))):
+                unreached = np.isinf(closest)
+                if unreached.any():
+                    landmark = int(np.argmax(unreached))
+                else:
+                    landmark = int(np.argmax(closest))
+                distances = self._dijkstra(landmark)
+                self.landmarks.append(landmark)
+                columns.append(distances)
+                closest = distances if len(columns) == 1 else np.minimum(closest, distances)
+        self.landmark_distances = np.column_stack(columns) if columns else np.zeros((len(self.nodes), 0))
+        # Per-node rows as tuples for the search loop
+        self._rows = [tuple(row) for row in self.landmark_distances.tolist()]
+
+    def _lower_bound(self, v, target_row):
+        """max over the landmarks of |d(L, target) - d(L, v)|, ignoring landmarks that reach neither node."""
+        bound = 0.0
+        for to_v, to_target in zip(self._rows[v], target_row):
+            if to_v == math.inf or to_target == math.inf:
+                if to_v != to_target:
+                    return math.inf  # The landmark reaches exactly one of them: different components
+                continue
+            difference = to_v - to_target if to_v > to_target else to_target - to_v
+            if difference > bound:
+                bound = difference
+        return bound
+
+    def distance_lower_bound(self, source, destination):
+        """
+        Returns:
+            float: The landmark lower bound of the distance between two nodes.
+        """
+        return self._lower_bound(self.node_index[source], self._rows[self.node_index[destination]])
+
+    def shortest_path(self, source, destination, bidirectional=True):
+        """
+        Find the shortest path between two nodes.
+
+        Args:
+            source (str): The source node.
+            destination (str): The destination node.
+            bidirectional (bool): If True, search from both ends; otherwise run unidirectional A*. Default is True.
+
+        Returns:
+            list or str: List of nodes in the shortest path if a path exists,
+                         otherwise a message indicating no path is found.
+
+        Raises:
+            ValueError: If a node is not in the graph.
+        """
+        path, _ = self.search(source, destination, bidirectional)
+        return path if path is not None else NO_PATH
+
+    def search(self, source, destination, bidirectional=True, use_landmarks=True):
+        """
+        Run one query and report its cost.
+
+        Args:
+            source (str): The source node.
+            destination (str): The destination node.
+            bidirectional (bool): If True, search from both ends. Default is True.
+            use_landmarks (bool): If False, the potentials are zero, i.e. plain (bidirectional) Dijkstra on the
+                                  same adjacency, as a baseline for the expansion counts. Default is True.
+
+        Returns:
+            tuple: (path, cost); (None, inf) when no path exists. The number of expanded nodes is stored in
+                   `last_expansions`.
+
+        Raises:
+            ValueError: If a node is not in the graph.
+        """
+        for node in (source, destination):
+            if node not in self.node_index:
+                raise ValueError(f"Unknown node '{node}'.")
+        s, t = self.node_index[source], self.node_index[destination]
+        if s == t:
+            self.last_expansions = 0
+            return [source], 0.0
+        if bidirectional:
+            return self._bidirectional(s, t, use_landmarks)
+        return self._unidirectional(s, t, use_landmarks)
+
+    def _path(self, parents, node):
+        path = []
+        while node is not None:
+            path.append(self.nodes[node])
+            node = parents[node]
+        return path
+
+    def _unidirectional(self, s, t, use_landmarks):
+        target_row = self._rows[t]
+        potentials = {}
+
+        def potential(v):
+            if not use_landmarks:
+                return 0.0
+            value = potentials.get(v)
+            if value is None:
+                value = potentials[v] = self._lower_bound(v, target_row)
+            return value
+
+        if potential(s) == math.inf:
+            self.last_expansions = 0
+            return None, math.inf
+        distances = {s: 0.0}
+        parents = {s: None}
+        heap = [(potential(s), s)]
+        expansions = 0
+        while heap:
+            key, node = heapq.heappop(heap)
+            distance = distances[node]
+            if key > distance + potential(node):
+                continue  # Stale entry
+            expansions += 1
+            if node == t:
+                self.last_expansions = expansions
+                path = self._path(parents, t)
+                path.reverse()
+                return path, distance
+            for neighbor, length in self._adjacency[node]:
+                candidate = distance + length
+                if candidate < distances.get(neighbor, math.inf):
+                    distances[neighbor] = candidate
+                    parents[neighbor] = node
+                    heapq.heappush(heap, (candidate + potential(neighbor), neighbor))
+        self.last_expansions = expansions
+        return None, math.inf
+
+    def _bidirectional(self, s, t, use_landmarks):
+        source_row, target_row = self._rows[s], self._rows[t]
+        if use_landmarks and self._lower_bound(s, target_row) == math.inf:
+            self.last_expansions = 0
+            return None, math.inf
+        potentials = {}
+
+        def potential(v):
+            # Average potential: forward keys use +p, backward keys -p, so both searches see the same
+            # non-negative reduced lengths and the usual bidirectional stopping rule stays exact
+            if not use_landmarks:
+                return 0.0
+            value = potentials.get(v)
+            if value is None:
+                value = potentials[v] = (self._lower_bound(v, target_row) - self._lower_bound(v, source_row)) / 2
+            return value
+
+        distances = ({s: 0.0}, {t: 0.0})
+        parents = ({s: None}, {t: None})
+        heaps = ([(potential(s), s)], [(-potential(t), t)])
+        signs = (1.0, -1.0)
+        best, meeting = math.inf, None
+        expansions = 0
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            key, node = heapq.heappop(heaps[side])
+            distance = distances[side][node]
+            if key > distance + signs[side] * potential(node):
+                continue  # Stale entry
+            expansions += 1
+            other = distances[1 - side]
+            for neighbor, length in self._adjacency[node]:
+                candidate = distance + length
+                if candidate < distances[side].get(neighbor, math.inf):
+                    distances[side][neighbor] = candidate
+                    parents[side][neighbor] = node
+                    heapq.heappush(heaps[side], (candidate + signs[side] * potential(neighbor), neighbor))
+                if neighbor in other and candidate + other[neighbor] < best:
+                    best = candidate + other[neighbor]
+                    meeting = (node, neighbor) if side == 0 else (neighbor, node)
+        self.last_expansions = expansions
+        if meeting is None:
+            return None, math.inf
+
+        forward = self._path(parents[0], meeting[0])
+        forward.reverse()
+        return forward + self._path(parents[1], meeting[1]), best
+
+    def benchmark(self, pairs):
+        """
+        Compare the node expansions of ALT with plain Dijkstra on the same adjacency.
+
+        Args:
+            pairs (iterable): (source, destination) pairs.
+
+        Returns:
+            dict: Summed expansions per method ("dijkstra", "bidirectional_dijkstra", "alt",
+                  "bidirectional_alt"), the number of queries and the number of cost mismatches against
+                  Dijkstra (always 0 unless something is broken).
+        """
+        methods = {"dijkstra": (False, False), "bidirectional_dijkstra": (True, False),
+                   "alt": (False, True), "bidirectional_alt": (True, True)}
+        totals = dict.fromkeys(methods, 0)
+        queries = mismatches = 0
+        for source, destination in pairs:
+            queries += 1
+            costs = {}
+            for name, (bidirectional, use_landmarks) in methods.items():
+                _, costs[name] = self.search(source, destination, bidirectional, use_landmarks)
+                totals[name] += self.last_expansions
+            mismatches += sum(not math.isclose(cost, costs["dijkstra"]) for cost in costs.values())
+        return dict(totals, queries=queries, cost_mismatches=mismatches)
@@ -1,6 +1,14 @@
 from network_creation import Mininet_Network
 from networkx_graph import Network_Graph
 from q_learning import QLearningPathFinder
+from hierarchical_q_learning import HierarchicalQLearningPathFinder
+from async_pipeline import Async_Pipeline
+from experience_replay import Replay_Memory
+from run_report import Run_Report
+from flow_rules import (path_flow_rules, flow_rules_for_paths, write_rules, unique_output_path, Bash_Script_Sink,
+                        Flow_Diff_Script_Sink, Flow_Table_State)
+import argparse
+import subprocess
 import threading
 import time
 import os
@@ -23,10 +31,18 @@ class SDN_Network_creator:
         source (str): The source host for path finding.
         destination (str): The destination host for path finding.
         threads (list): A list to keep track of active threads for visualization and path finding.
+        flow_state (Flow_Table_State): The flow tables installed on the running switches, or None if flow scripts
+                                       are not incremental. It is cleared whenever the network stops.
+        pending_flow_diffs (dict): (Flow_Table_State, Flow_Table_Diff) per written flow script whose changes are not
+                                   recorded yet, see `commit_routing_commands`.
+        report (Run_Report): Wall time, CPU time and memory of every stage of the run.
     """
 
     def __init__(self, network_switch_number:int=20, network_host_number_per_switch:int=2,
-                 load_existing_network:bool=False, network_topology_file_add:str="network_topology.csv"):
+                 load_existing_network:bool=False, network_topology_file_add:str="network_topology.csv",
+                 load_graph:bool=True, collapse_hosts:bool=False, flow_state_file:str=None, region_size:int=None,
+                 replay:str=None, report:Run_Report=None, trace_decay:float=0.0,
+                 heuristic_init:bool=False):
         """
         Initialize the SDN network.
 
@@ -37,29 +53,89 @@ class SDN_Network_creator:
             network_host_number_per_switch (int): The number of hosts to create per switch. Default is 2.
             load_existing_network (bool): If True, load the network topology from a CSV file. Default is False.
             network_topology_file_add (str): The path to the CSV file containing the network topology. Default is "network_topology.csv".
+            load_graph (bool): If True, build the graph and Q-learning model right away. If False, they are built by
+                               `load_topology`, e.g. as the first stage of `run_async`. Default is True.
+            collapse_hosts (bool): If True, Q-learning trains over the switches only and maps hosts to their
+                                   attached switch (see `QLearningPathFinder`). Default is False.
+            flow_state_file (str): If given, the flow tables installed by the generated scripts are kept in this JSON
+                                   file and the installed script only carries the changes (see `Flow_Table_State`).
+            region_size (int): If given, Q-learning runs hierarchically over connected regions of at most this many
+                               switches (see `HierarchicalQLearningPathFinder`), for very large fabrics.
+            replay (str): "uniform" or "prioritized" to train the "learn" solver with an experience replay memory
+                          (see `experience_replay.Replay_Memory`). Default is None (no replay).
+            report (Run_Report): Report to record the stages in. Default is a new report without memory tracing.
+            trace_decay (float): lambda of Watkins's Q(lambda) for the "learn" solver (see
+                                 `QLearningPathFinder.learn`). Default is 0.0 (one-step Q-learning).
+            heuristic_init (bool): If True, the "learn" solver starts from a Q-table seeded by a shortest-path pass
+                                   from the destination (see `QLearningPathFinder.initialize_from_shortest_paths`)
+                                   instead of the current table. Default is False.
 
         Raises:
             FileNotFoundError: If the specified CSV file is not found when `load_existing_network` is True.
+            ValueError: If `replay` is unknown, or `replay`, `trace_decay` or `heuristic_init` is combined with
+                        `region_size`.
             Exception: If any other error occurs during network initialization.
         """
+        self.report = report if report is not None else Run_Report("sdn_network")
+        self.report.add_metadata(switches=network_switch_number, hosts_per_switch=network_host_number_per_switch,
+                                 load_existing_network=load_existing_network, region_size=region_size, replay=replay)
+        self.network_topology_file_add = network_topology_file_add
+        self.collapse_hosts = collapse_hosts
+        self.region_size = region_size
+        if replay not in (None, "uniform", "prioritized"):
+            raise ValueError(f"Unknown replay '{replay}'.")
+        if replay is not None and region_size:
+            raise ValueError("Experience replay is not available with hierarchical Q-learning.")
+        if trace_decay and region_size:
+            raise ValueError("Eligibility traces are not available with hierarchical Q-learning.")
+        if heuristic_init and region_size:
+            raise ValueError("Heuristic initialization is not available with hierarchical Q-learning.")
+        self.trace_decay = trace_decay
+        self.heuristic_init = heuristic_init
+        self.replay_memory = Replay_Memory(prioritized=replay == "prioritized") if replay else None
+        self.flow_state = Flow_Table_State(flow_state_file) if flow_state_file else None
+        self.pending_flow_diffs = {}
         self.mininet = Mininet_Network(network_topology_file_add, network_switch_number, network_host_number_per_switch)
         
         if not load_existing_network:
-            self.mininet_setup(network_switch_number, network_host_number_per_switch)
+            with self.report.stage("network_setup"):
+                self.mininet_setup(network_switch_number, network_host_number_per_switch)
         else:
             try:
-                self.mininet.load_network_from_csv(network_topology_file_add)
+                with self.report.stage("network_load"):
+                    self.mininet.load_network_from_csv(network_topology_file_add)
             except FileNotFoundError:
                 raise FileNotFoundError("No network topology file found.")
             except Exception as e:
                 raise e
             
-        self.nx_graph = Network_Graph("network_topology.csv")
-        self.q_learning = QLearningPathFinder(self.nx_graph)
+        self.nx_graph = None
+        self.q_learning = None
+        if load_graph:
+            self.load_topology()
         # self.source = source
         # self.destination = destination
         self.threads = []
 
+    def load_topology(self):
+        """
+        Build the NetworkX graph and the Q-learning model from the topology CSV file.
+
+        Returns:
+            Network_Graph: The loaded network graph.
+        """
+        with self.report.stage("topology"):
+            with self.report.stage("graph"):
+                self.nx_graph = Network_Graph(self.network_topology_file_add)
+            with self.report.stage("q_learning_model"):
+                if self.region_size:
+                    self.q_learning = HierarchicalQLearningPathFinder(self.nx_graph, self.region_size)
+                else:
+                    self.q_learning = QLearningPathFinder(self.nx_graph, switches_only=self.collapse_hosts)
+        graph = self.nx_graph.get_networkx_graph()
+        self.report.add_metadata(nodes=graph.number_of_nodes(), links=graph.number_of_edges())
+        return self.nx_graph
+
     def mininet_setup(self, network_switch_number, network_host_number_per_switch):
         """
         Set up the Mininet network by creating switches, hosts, and links.
@@ -68,91 +144,210 @@ class SDN_Network_creator:
             network_switch_number (int): The number of switches to create.
             network_host_number_per_switch (int): The number of hosts to create per switch.
         """
-        self.mininet.create_n_switches(network_switch_number)
-        self.mininet.create_hosts_for_all_switches(network_host_number_per_switch)
-        self.mininet.generate_random_connected_network_with_connectivity_percentage(connectivity_percentage=50, connectivity_ensurence=True)
-        self.mininet.save_network_to_csv()
+        with self.report.stage("switches"):
+            self.mininet.create_n_switches(network_switch_number)
+        with self.report.stage("hosts"):
+            self.mininet.create_hosts_for_all_switches(network_host_number_per_switch)
+        with self.report.stage("links"):
+            self.mininet.generate_random_connected_network_with_connectivity_percentage(connectivity_percentage=50, connectivity_ensurence=True)
+        with self.report.stage("save_csv"):
+            self.mininet.save_network_to_csv()
 
-    def visualize_network(self):
+    def visualize_network(self, output_file=None):
         """
         Visualize the network graph using NetworkX.
 
         This method creates a graphical representation of the network topology.
+
+        Args:
+            output_file (str): If given, the figure is rendered headless and written to this file instead of being shown.
         """
-        self.nx_graph.visualize_graph()
+        with self.report.stage("visualization"):
+            self.nx_graph.visualize_graph(output_file)
 
-    def generate_routing_commands_based_on_path(self, path, output_file="path_based_flow_commands.sh"):
+    def generate_routing_commands_based_on_path(self, path, output_file="path_based_flow_commands.sh", unique_output=False,
+                                                flow_state=None):
         """
         Generate routing commands based on a given path and save them in a shell script.
 
+        The rules are streamed into the script, which is written under a temporary name and renamed into
+        place once complete, so concurrent runs never see or produce a half-written script.
+
         Args:
             path (list): A list of nodes representing the path from source to destination.
-            output_file (str): The name of the output shell script file. Default is "routing_commands_file.sh".
+            output_file (str): The name of the output shell script file. Default is "path_based_flow_commands.sh".
+            unique_output (bool): If True, write to a unique file name derived from `output_file` instead, so
+                                  batch runs never overwrite each other. Default is False.
+            flow_state (Flow_Table_State): If given, the path's rules replace the installed flow tables and the
+                                           script only carries the changes (see `update_routing_commands`). The
+                                           state is only updated by `commit_routing_commands`, once the script
+                                           has run.
+
+        Returns:
+            str: The path of the written script.
 
         Raises:
             ValueError: If `path` is empty or invalid.
             AttributeError: If the network graph is not properly initialized.
         """
-        if not path:
-            raise ValueError("Path cannot be empty.")
-    
-        if not hasattr(self.nx_graph, "link_details") or not hasattr(self.nx_graph, "IPs"):
-            raise AttributeError("Network graph is not properly initialized.")
-        
-        link_details = self.nx_graph.link_details  # Assuming you have link details in nx_graph
-        IPs = self.nx_graph.IPs  # Assuming you have IPs in nx_graph
-        # print("Link Details:", self.nx_graph.link_details)
-        with open(output_file, "w") as file:
-            file.write("#!/bin/bash\n\n")
-            file.write(f"# Forwarding rules for path: {path}\n")
-            dest_ip = IPs.get(path[-1])
-            source_ip = IPs.get(path[0])  # Get the destination IP
-            # Iterate through the path to generate routing commands
-            for i in range(1, len(path) - 1):
-                node0 = path[i - 1]  # Previous node
-                node1 = path[i]      # Current node
-                node2 = path[i + 1]  # Next node
-                in_port = None  # Initialize in_port
-                out_port = None  # Initialize out_port
-                
-                # Extract link details for the link between node1 and node2
-                link_info = link_details.get((node0, node1)) or link_details.get((node1, node0))
-                if link_info:
-                    # print(link_info)
-                    link_info_split = link_info.split(',')  # Assuming link_info is a string
-                    if link_info_split[0].startswith(f"{node0}"):
-                        in_port = link_info_split[1].split('-')[-1][-1]
-                    else:
-                        in_port = link_info_split[0].split('-')[-1][-1]
-                    # print(f"inport = {in_port}")                
-                link_info2 = link_details.get((node1, node2)) or link_details.get((node2, node1))
-                if link_info2:
-                    # print(link_info2)
-                    link_info2_split = link_info2.split(',')
-                    if link_info2_split[0].startswith(f"{node1}"):
-                        out_port = link_info2_split[0].split('-')[-1][-1]
-                    else:
-                        out_port = link_info2_split[1].split('-')[-1][-1]
-                    # print(f"outport = {out_port}")
-                if node1.startswith("s") and in_port is not None and out_port is not None:
-                    # Add flow command for routing the packet to the destination IP
-                    file.write(f'/usr/bin/ovs-ofctl add-flow {node1} "in_port={in_port},dl_type=0x0800,nw_dst={dest_ip},action=output:{out_port}"\n')
-                    file.write(f'/usr/bin/ovs-ofctl add-flow {node1} "in_port={out_port},dl_type=0x0800,nw_dst={source_ip},action=output:{in_port}"\n')
-            
-            for node in path:
-                if node.startswith("s"):
-                    file.write(f'/usr/bin/ovs-ofctl add-flow {node} "dl_type=0x0806,action=flood"\n')
+        with self.report.stage(f"flow_script:{os.path.basename(output_file)}"):
+            rules = path_flow_rules(self.nx_graph, path)
+            if unique_output:
+                output_file = unique_output_path(output_file)
+            comment = f"Forwarding rules for path: {path}"
+            if flow_state is not None:
+                sink = Flow_Diff_Script_Sink(output_file, flow_state, comment=comment, commit_state=False)
+                write_rules(rules, sink)
+                self.pending_flow_diffs[output_file] = (flow_state, sink.diff)
+                print(f"Flow table changes written to {output_file}: {sink.diff}")
+            else:
+                write_rules(rules, Bash_Script_Sink(output_file, comment=comment))
+                print(f"Forwarding rules written to {output_file}")
+        return output_file
 
-        os.chmod(output_file, 0o755)  # Set execute permissions
-        print(f"Forwarding rules written to {output_file}")
+    def generate_routing_commands_for_paths(self, paths, *sinks):
+        """
+        Stream the forwarding rules of any number of paths into one or more sinks.
+
+        Args:
+            paths (iterable): Paths (lists of nodes); may be a generator.
+            *sinks (Flow_Rule_Sink): Consumers of the rules, e.g. Bash_Script_Sink, Ofctl_Flow_File_Sink,
+                                     JSONL_Sink or Memory_Sink.
+
+        Returns:
+            int: The number of rules written.
+        """
+        return write_rules(flow_rules_for_paths(self.nx_graph, paths), *sinks)
+
+    def update_routing_commands(self, paths, output_file="flow_update_commands.sh"):
+        """
+        Write a script that moves the installed flow tables to the rules of a new set of paths.
+
+        `paths` is the complete routing: rules of paths that are no longer in it are deleted. Only the switches
+        whose rules changed get commands, so a reroute after a link change touches a handful of switches instead
+        of reinstalling the whole fabric. The flow state is not updated until the script has run: use
+        `apply_routing_commands` (or `reroute`, which does both), or run the script yourself and then call
+        `commit_routing_commands`. If it fails or never runs, the state keeps describing the tables actually
+        installed.
+
+        Args:
+            paths (iterable): Paths (lists of nodes); may be a generator.
+            output_file (str): The name of the update script. Default is "flow_update_commands.sh".
+
+        Returns:
+            Flow_Table_Diff: The changes written to the script.
+
+        Raises:
+            ValueError: If the SDN network was created without a flow state file.
+        """
+        if self.flow_state is None:
+            raise ValueError("Incremental updates need a flow state file (flow_state_file).")
+        sink = Flow_Diff_Script_Sink(output_file, self.flow_state, comment="Flow table update", commit_state=False)
+        write_rules(flow_rules_for_paths(self.nx_graph, paths), sink)
+        self.pending_flow_diffs[output_file] = (self.flow_state, sink.diff)
+        print(f"Flow table changes written to {output_file}: {sink.diff}")
+        return sink.diff
+
+    def commit_routing_commands(self, output_file):
+        """
+        Record the changes of a flow script in the flow state, once the script has run successfully.
+
+        Args:
+            output_file (str): The script, as returned by `generate_routing_commands_based_on_path` or passed to
+                               `update_routing_commands`.
+
+        Returns:
+            bool: True if a pending diff was committed, False if the script had none (e.g. it is not incremental).
+        """
+        pending = self.pending_flow_diffs.pop(output_file, None)
+        if pending is None:
+            return False
+        flow_state, diff = pending
+        flow_state.commit(diff)
+        return True
+
+    def apply_routing_commands(self, output_file="flow_update_commands.sh"):
+        """
+        Run a flow script against the running switches and, if it succeeds, commit its changes to the flow state.
+
+        Args:
+            output_file (str): The script. Default is "flow_update_commands.sh".
+
+        Raises:
+            RuntimeError: If the network is not running.
+            subprocess.CalledProcessError: If the script fails; the flow state is left unchanged.
+        """
+        if not self.mininet.running:
+            raise RuntimeError("Flow scripts can only be applied to a running network, "
+                               "see start_network(keep_running=True).")
+        subprocess.run(["bash", output_file], check=True)
+        self.commit_routing_commands(output_file)
+
+    def reroute(self, paths, output_file="flow_update_commands.sh"):
+        """
+        Move the running switches to a new routing: write the update script and apply it.
+
+        Only the switches whose rules changed are touched (see `update_routing_commands`).
+
+        Args:
+            paths (iterable): The complete new set of paths (lists of nodes); may be a generator.
+            output_file (str): The name of the update script. Default is "flow_update_commands.sh".
+
+        Returns:
+            Flow_Table_Diff: The changes applied.
+
+        Raises:
+            RuntimeError: If the network is not running.
+            ValueError: If the SDN network was created without a flow state file.
+            subprocess.CalledProcessError: If the script fails; the flow state is left unchanged.
+        """
+        if not self.mininet.running:
+            raise RuntimeError("Rerouting needs a running network, see start_network(keep_running=True).")
+        with self.report.stage("reroute"):
+            diff = self.update_routing_commands(paths, output_file)
+            self.apply_routing_commands(output_file)
+        return diff
+
+    def start_network(self, flow_file="dijkstra_flow_commands.sh", interactive=False, keep_running=False):
+        """
+        Start Mininet and install a flow script.
+
+        With `keep_running`, the network stays up and the script's changes are committed to the flow state, so
+        `reroute` can later update the live switches. Otherwise the network is stopped once the script (and the
+        CLI) ran, and the flow state is cleared like by `stop_network`.
+
+        Args:
+            flow_file (str): The flow script to install. Default is "dijkstra_flow_commands.sh".
+            interactive (bool): If True, open the Mininet CLI after the flows are installed. Default is False.
+            keep_running (bool): If True, leave the network running until `stop_network`. Default is False.
+
+        Returns:
+            bool: True if the flow script ran successfully.
+        """
+        with self.report.stage("network"):
+            executed = self.mininet.start_network(flow_file, interactive=interactive, keep_running=keep_running)
+        if not keep_running:
+            self.stop_network()
+        elif executed:
+            self.commit_routing_commands(flow_file)
+        return executed
+
+    def stop_network(self):
+        """
+        Stop Mininet and clear the flow state: the switches and their flow tables are gone, and the next network
+        starts with empty tables. Scripts written for the stopped network are dropped from the pending diffs.
+        """
+        self.mininet.stop_network()
+        self.pending_flow_diffs.clear()
+        if self.flow_state is not None:
+            self.flow_state.clear()
 
     def generate_normal_routing_commands(self, output_file="normal_flow_commands.sh"):
         with open(output_file, 'w') as file:
             file.write("#!/bin/bash\n")
             file.write(f"# Normal forwarding rules:\n")
-            for node in self.nx_graph.graph.nodes():
-                if node.startswith("s"):
-                    file.write(f'/usr/bin/ovs-ofctl add-flow {node} action=normal\n')
+            for node in self.nx_graph.topology.switches():
+                file.write(f'/usr/bin/ovs-ofctl add-flow {node} action=normal\n')
 
         os.chmod(output_file, 0o755)
         print(f"Commands written to {output_file}")
@@ -164,23 +359,53 @@ class SDN_Network_creator:
         This method calculates the shortest path between the source and destination hosts using Dijkstra's algorithm
         and generates the corresponding forwarding rules.
         """
-        start_time = time.time()
-        d_path = self.nx_graph.dijkstra_path_findings(source, dest)
-        end_time = time.time()
+        with self.report.stage("dijkstra_path"):
+            start_time = time.time()
+            d_path = self.nx_graph.dijkstra_path_findings(source, dest)
+            end_time = time.time()
         if d_path:
-            self.generate_routing_commands_based_on_path(d_path, "dijkstra_flow_commands.sh")
+            self.generate_routing_commands_based_on_path(d_path, "dijkstra_flow_commands.sh", flow_state=self.flow_state)
         else:
             print("No path found between the given nodes")
         print(f"Shortest path found using Dijkstra's algorithm: {d_path} in {end_time - start_time} seconds")
         print("----------------------------------")
         return d_path
 
-    def Q_learning_path_finding(self, source, dest, exploration_rate=1.0, learning_rate=0.6, discount_factor=0.9, learn_episodes=20000):
+    def train_q_learning(self, source, dest, exploration_rate=1.0, learning_rate=0.6, discount_factor=0.9,
+                         learn_episodes=20000, solver="learn"):
+        """
+        Train the Q-table for a source/destination pair.
+
+        Args:
+            solver (str): "learn" samples `learn_episodes` episodes; "plan" computes the Q-table from the reward
+                          model with value iteration over the moves toward the destination
+                          (`QLearningPathFinder.plan`), ignoring the exploration and learning rates.
+        """
+        if solver not in ("learn", "plan"):
+            raise ValueError(f"Unknown solver '{solver}'.")
+        with self.report.stage("q_learning_training"):
+            if solver == "plan":
+                sweeps = self.q_learning.plan(dest, discount_factor)
+                print(f"Q-table planned in {sweeps} sweeps")
+            else:
+                if self.heuristic_init:
+                    self.q_learning.initialize_from_shortest_paths(dest, discount_factor)
+                options = {}
+                if self.replay_memory is not None:
+                    options["replay"] = self.replay_memory
+                if self.trace_decay:
+                    options["trace_decay"] = self.trace_decay
+                self.q_learning.learn(source, dest, exploration_rate, learning_rate, discount_factor, learn_episodes,
+                                      **options)
+
+    def Q_learning_path_finding(self, source, dest, exploration_rate=1.0, learning_rate=0.6, discount_factor=0.9, learn_episodes=20000,
+                                solver="learn"):
         
-        self.q_learning.learn(source, dest, exploration_rate, learning_rate, discount_factor, learn_episodes)
-        start_time = time.time()
-        q_path = self.q_learning.shortest_path(source, dest)
-        end_time = time.time()
+        self.train_q_learning(source, dest, exploration_rate, learning_rate, discount_factor, learn_episodes, solver)
+        with self.report.stage("q_learning_path"):
+            start_time = time.time()
+            q_path = self.q_learning.shortest_path(source, dest)
+            end_time = time.time()
         if q_path:
             self.generate_routing_commands_based_on_path(q_path, "q_learning_flow_commands.sh")
         else:
@@ -199,31 +424,145 @@ class SDN_Network_creator:
         min_bandwidth = min(self.nx_graph.graph[u][v]['bandwidth'] for u, v in zip(path[:-1], path[1:]))
         return total_delay, min_bandwidth
     
-    def path_finding(self, source, dest, exploration_rate=1.0, learning_rate=0.6, discount_factor=0.9, learn_episodes=20000):
+    def path_finding(self, source, dest, exploration_rate=1.0, learning_rate=0.6, discount_factor=0.9, learn_episodes=20000,
+                     solver="learn"):
         # print(self.q_learning.compare_with_dijkstra(source, dest))
-        q_path = self.Q_learning_path_finding(source, dest, exploration_rate, learning_rate, discount_factor, learn_episodes)
-        d_path = self.dijkstra_path_finding(source, dest)
-        q_delay, q_bandwidth = self.evaluate_path(q_path) if isinstance(q_path, list) else (None, None)
-        d_delay, d_bandwidth = self.evaluate_path(d_path)
+        with self.report.stage("path_finding"):
+            q_path = self.Q_learning_path_finding(source, dest, exploration_rate, learning_rate, discount_factor, learn_episodes, solver)
+            d_path = self.dijkstra_path_finding(source, dest)
+            with self.report.stage("evaluation"):
+                q_delay, q_bandwidth = self.evaluate_path(q_path) if isinstance(q_path, list) else (None, None)
+                d_delay, d_bandwidth = self.evaluate_path(d_path)
         print(f"q_learning_path_metrics = (delay :{q_delay}, bandwidth:{q_bandwidth})")
         print(f"dijkstra_path_metrics = (delay :{d_delay}, bandwidth:{d_bandwidth})")
         
     
-    def run(self, source, dest):
+    def run(self, source, dest, solver="learn", learn_episodes=20000, keep_running=False):
         """
         Run the path-finding algorithms and start the network with generated rules.
 
         This method starts threads for visualization and path finding, executes the routing commands,
-        and stops the network after completion.
+        and stops the network after completion, unless `keep_running` is True (see `start_network`).
         """
-        path_finding_thread = threading.Thread(target=self.path_finding, args=(source, dest,))
+        path_finding_thread = threading.Thread(target=self.path_finding, args=(source, dest,),
+                                               kwargs={"solver": solver, "learn_episodes": learn_episodes})
         path_finding_thread.start()
 
         self.visualize_network()
         path_finding_thread.join()
-        self.mininet.start_network("dijkstra_flow_commands.sh")
+        self.start_network("dijkstra_flow_commands.sh", interactive=True, keep_running=keep_running)
         self.stop()
 
+    def build_pipeline(self, source, dest, visualization_file=None, start_network=True, interactive=False,
+                       unique_outputs=False, exploration_rate=1.0, learning_rate=0.6, discount_factor=0.9, learn_episodes=20000,
+                       solver="learn", keep_running=False):
+        """
+        Build the asynchronous pipeline used by `run_async`.
+
+        The stages and their dependencies are:
+            topology -> q_learning_training -> q_learning_path -> q_learning_flows
+            topology -> dijkstra_path -> dijkstra_flows -> network
+            topology -> visualization (only if `visualization_file` is given)
+            q_learning_path, dijkstra_path -> evaluation
+
+        Args:
+            source (str): The source host for path finding.
+            dest (str): The destination host for path finding.
+            visualization_file (str): If given, render the topology headless to this file. Default is no visualization.
+            start_network (bool): If True, start Mininet once the Dijkstra flow script exists. Default is True.
+            interactive (bool): If True, open the Mininet CLI after the flows are installed. Default is False.
+            unique_outputs (bool): If True, flow scripts get unique file names so concurrent runs never collide.
+            exploration_rate, learning_rate, discount_factor, learn_episodes: Q-learning training parameters.
+            solver (str): "learn" (sampled episodes) or "plan" (value iteration), see `train_q_learning`.
+            keep_running (bool): If True, the started network stays up for `reroute` (see `start_network`).
+
+        Returns:
+            Async_Pipeline: The pipeline, ready to run.
+        """
+        pipeline = Async_Pipeline()
+
+        def load_topology():
+            return self.nx_graph if self.nx_graph is not None else self.load_topology()
+
+        def train_q_learning(_graph):
+            self.train_q_learning(source, dest, exploration_rate, learning_rate, discount_factor, learn_episodes, solver)
+
+        def q_learning_path(_trained):
+            with self.report.stage("q_learning_path"):
+                start_time = time.time()
+                q_path = self.q_learning.shortest_path(source, dest)
+                end_time = time.time()
+            print(f"Shortest path found using Q-learning algorithm: {q_path} in {end_time - start_time} seconds")
+            return q_path
+
+        def dijkstra_path(_graph):
+            with self.report.stage("dijkstra_path"):
+                start_time = time.time()
+                d_path = self.nx_graph.dijkstra_path_findings(source, dest)
+                end_time = time.time()
+            print(f"Shortest path found using Dijkstra's algorithm: {d_path} in {end_time - start_time} seconds")
+            return d_path
+
+        def write_flows(path, output_file, flow_state=None):
+            if not isinstance(path, list):
+                print("No path found between the given nodes")
+                return None
+            return self.generate_routing_commands_based_on_path(path, output_file, unique_outputs, flow_state)
+
+        def write_installed_flows(path):
+            # The Dijkstra script is the one installed, so it alone is diffed against the flow state
+            return write_flows(path, "dijkstra_flow_commands.sh", self.flow_state)
+
+        def evaluate(q_path, d_path):
+            with self.report.stage("evaluation"):
+                q_metrics = self.evaluate_path(q_path) if isinstance(q_path, list) else (None, None)
+                d_metrics = self.evaluate_path(d_path) if isinstance(d_path, list) else (None, None)
+            print(f"q_learning_path_metrics = (delay :{q_metrics[0]}, bandwidth:{q_metrics[1]})")
+            print(f"dijkstra_path_metrics = (delay :{d_metrics[0]}, bandwidth:{d_metrics[1]})")
+            return {"q_learning": q_metrics, "dijkstra": d_metrics}
+
+        def run_network(flow_file):
+            if flow_file is None:
+                print("No flow commands available, not starting the network.")
+                return False
+            return self.start_network(flow_file, interactive=interactive, keep_running=keep_running)
+
+        pipeline.add_stage("topology", load_topology)
+        pipeline.add_stage("q_learning_training", train_q_learning, depends_on=["topology"])
+        pipeline.add_stage("q_learning_path", q_learning_path, depends_on=["q_learning_training"])
+        pipeline.add_stage("q_learning_flows", lambda path: write_flows(path, "q_learning_flow_commands.sh"),
+                           depends_on=["q_learning_path"])
+        pipeline.add_stage("dijkstra_path", dijkstra_path, depends_on=["topology"])
+        pipeline.add_stage("dijkstra_flows", write_installed_flows, depends_on=["dijkstra_path"])
+        pipeline.add_stage("evaluation", evaluate, depends_on=["q_learning_path", "dijkstra_path"])
+        if visualization_file is not None:
+            pipeline.add_stage("visualization", lambda _graph: self.visualize_network(visualization_file),
+                               depends_on=["topology"])
+        if start_network:
+            pipeline.add_stage("network", run_network, depends_on=["dijkstra_flows"])
+        return pipeline
+
+    def run_async(self, source, dest, visualization_file=None, start_network=True, interactive=False,
+                  unique_outputs=False, exploration_rate=1.0, learning_rate=0.6, discount_factor=0.9, learn_episodes=20000,
+                  solver="learn", keep_running=False):
+        """
+        Run topology loading, path finding, flow generation and network startup as a non-blocking pipeline.
+
+        Unlike `run`, nothing waits on a GUI window: visualization is optional and rendered to a file,
+        the Dijkstra branch and the network startup do not wait for Q-learning training, and with
+        `interactive=False` the whole run finishes without user input.
+
+        Args:
+            See `build_pipeline`.
+
+        Returns:
+            dict: Mapping of stage name to the value returned by that stage.
+        """
+        pipeline = self.build_pipeline(source, dest, visualization_file, start_network, interactive, unique_outputs,
+                                       exploration_rate, learning_rate, discount_factor, learn_episodes, solver,
+                                       keep_running)
+        return pipeline.run_sync()
+
     def stop(self):
         """
         Stop all active threads.
@@ -239,9 +578,68 @@ def get_user_inputs():
     destination = input("please enter your dest node:").lower()
     return source, destination
 
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Path finding with Q-learning and Dijkstra in a Mininet network.")
+    parser.add_argument("--switches", type=int, default=5, help="number of switches to create")
+    parser.add_argument("--topology-file", help="load this topology CSV (e.g. from topology_generators.py) instead "
+                                                "of generating a random network")
+    parser.add_argument("--hosts-per-switch", type=int, default=2, help="number of hosts per switch")
+    parser.add_argument("--source", help="source node; asked interactively if omitted")
+    parser.add_argument("--dest", help="destination node; asked interactively if omitted")
+    parser.add_argument("--async", dest="run_async", action="store_true",
+                        help="run the stages as a non-blocking asyncio pipeline")
+    parser.add_argument("--visualization-file", help="render the topology headless to this file (async mode)")
+    parser.add_argument("--no-network", action="store_true", help="do not start Mininet (async mode)")
+    parser.add_argument("--interactive", action="store_true", help="open the Mininet CLI (async mode)")
+    parser.add_argument("--solver", choices=["learn", "plan"], default="learn",
+                        help="train Q by sampled episodes or compute it by value iteration toward the destination")
+    parser.add_argument("--collapse-hosts", action="store_true", help="train Q-learning over the switch graph only")
+    parser.add_argument("--region-size", type=int,
+                        help="train Q-learning hierarchically over regions of at most this many switches")
+    parser.add_argument("--replay", choices=["uniform", "prioritized"],
+                        help="train with an experience replay memory (learn solver)")
+    parser.add_argument("--trace-decay", type=float, default=0.0,
+                        help="lambda of Watkins's Q(lambda) eligibility traces (learn solver); 0 is one-step Q-learning")
+    parser.add_argument("--heuristic-init", action="store_true",
+                        help="seed the Q-table from a shortest-path pass from the destination (learn solver)")
+    parser.add_argument("--learn-episodes", type=int, default=20000, help="episodes of the learn solver")
+    parser.add_argument("--flow-state", help="keep the installed flow tables in this JSON file and write only the "
+                                             "changed rules to the installed script")
+    parser.add_argument("--report-file", help="write the per-stage time and memory report of the run to this JSON file")
+    parser.add_argument("--metrics-file", help="append the run report as one JSON line to this metrics file")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="record Python allocation peaks per stage with tracemalloc (slower)")
+    return parser.parse_args(argv)
+
 if __name__ == "__main__":
     # signal.signal(signal.SIGINT, signal_handler)
-    x = SDN_Network_creator(5, 2)
-    source , dest = get_user_inputs()
-    x.run(source , dest)
+    args = parse_args()
+    report = Run_Report("async" if args.run_async else "run", trace_memory=args.trace_memory)
+    report.add_metadata(solver=args.solver, learn_episodes=args.learn_episodes)
+    try:
+        x = SDN_Network_creator(args.switches, args.hosts_per_switch, load_existing_network=bool(args.topology_file),
+                                network_topology_file_add=args.topology_file or "network_topology.csv",
+                                load_graph=not args.run_async,
+                                collapse_hosts=args.collapse_hosts, flow_state_file=args.flow_state,
+                                region_size=args.region_size, replay=args.replay, report=report,
+                                trace_decay=args.trace_decay, heuristic_init=args.heuristic_init)
+        if args.source and args.dest:
+            source, dest = args.source.lower(), args.dest.lower()
+        else:
+            source , dest = get_user_inputs()
+        report.add_metadata(source=source, dest=dest)
+        if args.run_async:
+            x.run_async(source, dest, visualization_file=args.visualization_file,
+                        start_network=not args.no_network, interactive=args.interactive, solver=args.solver,
+                        learn_episodes=args.learn_episodes)
+        else:
+            x.run(source , dest, solver=args.solver, learn_episodes=args.learn_episodes)
+    finally:
+        # Failed runs are reported too; their last stage carries the error
+        if args.report_file or args.metrics_file:
+            print(report.summary())
+        if args.report_file:
+            report.write(args.report_file)
+        if args.metrics_file:
+            report.append_to_metrics_file(args.metrics_file)
     print("done!")
\ No newline at end of file
@@ -1,5 +1,6 @@
 from mininet.net import Mininet
 from mininet.cli import CLI
+from topology_core import Link_Record, Topology_Index, SWITCH, HOST
 import csv
 import subprocess
 import random
@@ -17,7 +18,11 @@ class Mininet_Network:
         network_topology_file_add (str): The path to the CSV file for saving/loading the network topology.
         switches (list): A list of switches in the network.
         hosts (list): A list of hosts in the network.
-        link_properties (list): A list of link properties (delay, bandwidth, loss) for the network.
+        topology (Topology_Index): Integer-ID index of the nodes and of every link with its properties (delay,
+                                   bandwidth, loss), used for constant-time lookups.
+        IPs (dict): Mapping of host name to IP address.
+        pending_host_ips (dict): Host IPs loaded from CSV that are assigned once the network has started.
+        running (bool): Whether the network has been started and not stopped yet.
     """
 
     def __init__(self, network_topology_file_add, network_switch_number, network_host_number_per_switch):
@@ -34,7 +39,28 @@ class Mininet_Network:
         self.network_host_number_per_switch = network_host_number_per_switch
         self.switches = []
         self.hosts = []
-        self.link_properties = []
+        self.topology = Topology_Index()
+        self.IPs = {}
+        self.pending_host_ips = {}
+        self.running = False
+
+    def _record_link(self, node1: str, node2: str, delay, bw, loss, link_details=None):
+        """
+        Record a link and its properties in the topology index.
+
+        Args:
+            node1 (str): The first node of the link.
+            node2 (str): The second node of the link.
+            delay: Delay in ms, or None.
+            bw: Bandwidth in Mbps, or None.
+            loss: Packet loss in percent, or None.
+            link_details (str): The interfaces as in the CSV "Link Details" column, if known.
+        """
+        if link_details:
+            record = Link_Record.from_link_details(node1, node2, link_details, delay=delay, bandwidth=bw, loss=loss)
+        else:
+            record = Link_Record(node1, node2, delay=delay, bandwidth=bw, loss=loss)
+        self.topology.add_link(record)
 
     def create_n_switches(self, switch_numbers: int):
         """
@@ -104,20 +130,14 @@ class Mininet_Network:
                 self.network.addLink(host, self.switches[i])
                 self.hosts.append(host)
                 
-                # Add the host-switch link to self.link_properties
+                # Add the host-switch link to the topology index
                 link_tuple = tuple(sorted((host.name, self.switches[i].name)))  # Ensure order doesn't matter
                 delay = random.randint(1, 20)  # Random delay between 1ms and 20ms
                 bw = random.choice([10, 50, 100, 1000])  # Random bandwidth in Mbps
                 loss = round(random.uniform(0.0, 2.0), 2)  # Random packet loss between 0% and 2%
 
-                # Add the link properties to self.link_properties
-                self.link_properties.append({
-                    "node1": host.name,
-                    "node2": self.switches[i].name,
-                    "delay": delay,
-                    "bw": bw,
-                    "loss": loss
-                })
+                # Add the link properties to the topology index
+                self._record_link(host.name, self.switches[i].name, delay, bw, loss)
 
 
     def get_ip_for_node(self, node_name: str) -> str:
@@ -167,17 +187,17 @@ class Mininet_Network:
                 loss = "N/A"
 
                 # Assign IP for host-to-switch links
-                if node1.startswith("h"):
+                if self.topology.is_host(node1):
                     ip_address = self.IPs.get(node1).split('/')[0]
-                elif node2.startswith("h"):
+                elif self.topology.is_host(node2):
                     ip_address = self.IPs.get(node2).split('/')[0]
 
                 # Match link properties if available
-                for prop in self.link_properties:
-                    if {node1, node2} == {prop["node1"], prop["node2"]}:
-                        delay = prop["delay"]
-                        bw = prop["bw"]
-                        loss = prop["loss"]
+                record = self.topology.get_link(node1, node2)
+                if record is not None:
+                    delay = record.delay
+                    bw = record.bandwidth
+                    loss = record.loss
 
                 # Write row to CSV
                 writer.writerow({
@@ -204,17 +224,29 @@ class Mininet_Network:
         self.create_links_between_all_switches()
         self.create_hosts_for_all_switches(host_number_per_switch)
 
-    def start_network(self, routing_commands_file: str = "path_based_flow_commands.sh"):
+    def start_network(self, routing_commands_file: str = "path_based_flow_commands.sh", interactive: bool = True,
+                      keep_running: bool = False):
         """
         Start the network, save its topology to a CSV file, and execute a routing commands script.
 
         Args:
             routing_commands_file (str): Path to the shell script containing routing commands to execute.
+            interactive (bool): If True, open the Mininet CLI before stopping the network. If False, the network
+                                is stopped right after the routing commands ran, so the call never blocks on user input.
+            keep_running (bool): If True, leave the network running after the routing commands (and the CLI), so
+                                 later scripts can update the live switches; stop it with `stop_network`.
+                                 Default is False.
+
+        Returns:
+            bool: True if the routing commands script ran successfully.
 
         Raises:
             FileNotFoundError: If the routing commands file does not exist.
-            subprocess.CalledProcessError: If the script execution fails.
+            PermissionError: If the routing commands file is not executable.
+            RuntimeError: If the network is already running.
         """
+        if self.running:
+            raise RuntimeError("The network is already running.")
         if not os.path.exists(routing_commands_file):
             raise FileNotFoundError(f"Routing commands file '{routing_commands_file}' not found.")
 
@@ -223,6 +255,8 @@ class Mininet_Network:
 
         # Start the network
         self.network.start()
+        self.running = True
+        self.assign_pending_host_ips()
 
         # Explicitly set custom IP addresses and netmask for all hosts after starting the network
         # for host in self.hosts:
@@ -232,25 +266,47 @@ class Mininet_Network:
         try:
             subprocess.run(["bash", routing_commands_file], check=True)
             print("Routing rules executed successfully!")
+            executed = True
         except subprocess.CalledProcessError as e:
             print(f"Error executing routing commands: {e}")
+            executed = False
 
         # Start the Mininet CLI
-        CLI(self.network)
-        self.network.stop()
-
-    def load_network_from_csv(self):
+        if interactive:
+            CLI(self.network)
+        if not keep_running:
+            self.stop_network()
+        return executed
+
+    def stop_network(self):
+        """Stop the network if it is running."""
+        if self.running:
+            self.network.stop()
+            self.running = False
+
+    def load_network_from_csv(self, csv_file: str = None):
         """
         Load a network topology from a CSV file, creating nodes (switches and hosts) and links.
 
+        Rows are processed in a single pass: duplicate links are dropped through a set of normalized
+        node pairs (instead of scanning the existing links with `linksBetween` for every row), and host
+        IP addresses are collected and assigned in one batch by `start_network` once the network is up.
+
+        Args:
+            csv_file (str): Path to the CSV file. Default is `network_topology_file_add`.
+
         Raises:
             FileNotFoundError: If the CSV file does not exist.
             KeyError: If the CSV file is missing required columns.
         """
+        if csv_file is not None:
+            self.network_topology_file_add = csv_file
+
         try:
             with open(self.network_topology_file_add, 'r') as file:
                 reader = csv.DictReader(file)  # Use DictReader for easier access to columns
                 nodes = {}
+                seen_links = set()
 
                 for row in reader:
                     node1 = row["Node1"]
@@ -262,50 +318,41 @@ class Mininet_Network:
                     loss = float(row["Loss"]) if row["Loss"] != "N/A" else None
 
                     # Create nodes (switches and hosts)
-                    if node1 not in nodes:
-                        if node1.startswith("s"):
-                            nodes[node1] = self.network.addSwitch(node1)
-                            self.switches.append(nodes[node1])
-                        elif node1.startswith("h"):
-                            nodes[node1] = self.network.addHost(node1)
-                            self.hosts.append(nodes[node1])
-
-                    if node2 not in nodes:
-                        if node2.startswith("s"):
-                            nodes[node2] = self.network.addSwitch(node2)
-                            self.switches.append(nodes[node2])
-                        elif node2.startswith("h"):
-                            nodes[node2] = self.network.addHost(node2)
-                            self.hosts.append(nodes[node2])
+                    for node in (node1, node2):
+                        if node not in nodes:
+                            node_type = self.topology.node_type(node)
+                            if node_type == SWITCH:
+                                nodes[node] = self.network.addSwitch(node)
+                                self.switches.append(nodes[node])
+                            elif node_type == HOST:
+                                nodes[node] = self.network.addHost(node)
+                                self.hosts.append(nodes[node])
+
+                    # Skip links that were already created by an earlier row
+                    link_key = (node1, node2) if node1 <= node2 else (node2, node1)
+                    if link_key in seen_links:
+                        continue
+                    seen_links.add(link_key)
 
                     # Parse link details to get specific interfaces
                     intf1_name, intf2_name = link_details.split(', ')
 
-                    # Check if the link already exists
-                    if not self.network.linksBetween(nodes[node1], nodes[node2]):
-                        # Add the link between nodes with the specified interface names and properties
-                        self.network.addLink(
-                            nodes[node1], nodes[node2],
-                            intfName1=intf1_name, intfName2=intf2_name,
-                            bw=bw, delay=f"{delay}ms", loss=loss
-                        )
-
-                    # Assign IP addresses to hosts only (ignore switches)
-                    if node1.startswith("h") and ip_address != "N/A":
-                        if nodes[node1].defaultIntf():  # Check if interface exists
-                            nodes[node1].setIP(ip_address)
-                    if node2.startswith("h") and ip_address != "N/A":
-                        if nodes[node2].defaultIntf():  # Check if interface exists
-                            nodes[node2].setIP(ip_address)
+                    # Add the link between nodes with the specified interface names and properties
+                    self.network.addLink(
+                        nodes[node1], nodes[node2],
+                        intfName1=intf1_name, intfName2=intf2_name,
+                        bw=bw, delay=f"{delay}ms" if delay is not None else None, loss=loss
+                    )
+
+                    # Host IPs are assigned in one batch after the network has started
+                    if ip_address != "N/A":
+                        for node in (node1, node2):
+                            if self.topology.is_host(node):
+                                self.pending_host_ips[node] = ip_address
+                                self.IPs[node] = ip_address
 
                     # Store link properties
-                    self.link_properties.append({
-                        "node1": node1,
-                        "node2": node2,
-                        "delay": delay,
-                        "bw": bw,
-                        "loss": loss
-                    })
+                    self._record_link(node1, node2, delay, bw, loss, link_details)
         except FileNotFoundError:
             print(f"Error: File '{self.network_topology_file_add}' not found.")
             raise
@@ -313,6 +360,18 @@ class Mininet_Network:
             print(f"Error in CSV file: {e}")
             raise
 
+    def assign_pending_host_ips(self):
+        """
+        Assign the host IP addresses collected by `load_network_from_csv` in a single batch.
+
+        This must run after `network.start()`, when every host interface exists.
+        """
+        for host_name, ip_address in self.pending_host_ips.items():
+            host = self.network.getNodeByName(host_name)
+            if host.defaultIntf():  # Check if interface exists
+                host.setIP(ip_address)
+        self.pending_host_ips = {}
+
     def generate_fully_connected_network(self):
         """
         Generate random link properties to connect all switches in the network into one group.
@@ -341,13 +400,7 @@ class Mininet_Network:
                 loss = round(random.uniform(0.0, 2.0), 2)  
 
                 # Append the generated properties to the list
-                self.link_properties.append({
-                    "node1": node1,
-                    "node2": node2,
-                    "delay": delay,
-                    "bw": bw,
-                    "loss": loss
-                })
+                self._record_link(node1, node2, delay, bw, loss)
 
                 node1_obj = self.network.getNodeByName(node1)  
                 node2_obj = self.network.getNodeByName(node2)  
@@ -405,13 +458,7 @@ class Mininet_Network:
                 loss = round(random.uniform(0.0, 2.0), 2)  
 
                 # Store link properties
-                self.link_properties.append({
-                    "node1": node1,
-                    "node2": node2,
-                    "delay": delay,
-                    "bw": bw,
-                    "loss": loss
-                })
+                self._record_link(node1, node2, delay, bw, loss)
 
                 # Add the link to the network
                 node1_obj = self.network.getNodeByName(node1)
@@ -465,14 +512,8 @@ class Mininet_Network:
             if node1_obj and node2_obj:
                 self.network.addLink(node1_obj, node2_obj, bw=bw, delay=f"{delay}ms", loss=loss)
 
-            # Add the link properties to self.link_properties
-            self.link_properties.append({
-                "node1": node1,
-                "node2": node2,
-                "delay": delay,
-                "bw": bw,
-                "loss": loss
-            })
+            # Add the link properties to the topology index
+            self._record_link(node1, node2, delay, bw, loss)
 
             # Mark node2 as connected
             connected_switches.add(node2)
@@ -480,7 +521,7 @@ class Mininet_Network:
         # Optionally add additional links based on connectivity_percentage
         if connectivity_ensurence:
             total_possible_links = len(switch_names) * (len(switch_names) - 1) // 2
-            additional_links = int((connectivity_percentage / 100) * total_possible_links) - len(self.link_properties)
+            additional_links = int((connectivity_percentage / 100) * total_possible_links) - len(self.topology.links)
 
             for _ in range(additional_links):
                 node1 = random.choice(switch_names)
@@ -495,13 +536,7 @@ class Mininet_Network:
                     if node1_obj and node2_obj:
                         self.network.addLink(node1_obj, node2_obj, bw=bw, delay=f"{delay}ms", loss=loss)
 
-                    self.link_properties.append({
-                        "node1": node1,
-                        "node2": node2,
-                        "delay": delay,
-                        "bw": bw,
-                        "loss": loss
-                    })
+                    self._record_link(node1, node2, delay, bw, loss)
 
 
 # debug usecase: 
@@ -1,22 +1,61 @@
 import networkx as nx
 import csv
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+from matplotlib.lines import Line2D
+import hashlib
+import math
+from collections import OrderedDict
+from topology_core import Link_Record, Topology_Index
+from landmark_search import ALT_Path_Finder
 # print(nx.__version__)
 
+# Rendering limits: above SMALL_GRAPH_NODE_LIMIT nodes are drawn small and unlabeled, above
+# LARGE_GRAPH_NODE_LIMIT the "auto" layout falls back to a linear-time shell layout.
+SMALL_GRAPH_NODE_LIMIT = 100
+LARGE_GRAPH_NODE_LIMIT = 3000
+EDGE_LABEL_THRESHOLD = 60
+LAYOUT_SEED = 42
+
+# Computed layouts, keyed by (topology fingerprint, layout name); the least recently used ones are
+# evicted beyond LAYOUT_CACHE_SIZE entries, so long-running processes do not grow without bound
+LAYOUT_CACHE_SIZE = 16
+_layout_cache = OrderedDict()
+
 class Network_Graph:
-    def __init__(self, csv_file):
+    def __init__(self, csv_file=None):
         """
         Initialize the Network_Graph object by loading a network topology from a CSV file.
 
         Args:
-            csv_file (str): Path to the CSV file containing the network topology.
+            csv_file (str): Path to the CSV file containing the network topology. If None, the graph starts
+                            empty (see `from_link_records`).
         """
         self.graph = nx.Graph()
-        self.link_details = {}
         self.IPs = {}
+        self.topology = Topology_Index()
         self.switches = []
         self.hosts = []
-        self.load_network_topology(csv_file)
+        self._alt_path_finders = {}
+        if csv_file is not None:
+            self.load_network_topology(csv_file)
+
+    @classmethod
+    def from_link_records(cls, records):
+        """
+        Build a graph directly from Link_Records, e.g. from `topology_generators`, without a CSV round trip.
+
+        Args:
+            records (iterable): The links.
+
+        Returns:
+            Network_Graph: The graph.
+        """
+        network_graph = cls()
+        for record in records:
+            network_graph.add_link_record(record)
+        return network_graph
 
     @property
     def nodes(self):
@@ -64,32 +103,43 @@ class Network_Graph:
             for row in reader:
                 node1 = row["Node1"]
                 node2 = row["Node2"]
-                link_details = row["Link Details"]
-                delay = float(row["Delay(ms)"])
-                bandwidth = float(row["Bandwidth"])
-                loss = float(row["Loss"])
                 ip = row.get("IP Address", None)
                 # Calculate the edge cost using a weighted sum (adjust alpha, beta, gamma as needed)
                 # cost = 0.5 * delay + 0.3 * (1 / bandwidth) + 0.2 * loss
+                record = Link_Record.from_link_details(
+                    node1, node2, row["Link Details"],
+                    delay=float(row["Delay(ms)"]), bandwidth=float(row["Bandwidth"]), loss=float(row["Loss"]),
+                    ip=ip if ip and ip != "N/A" else None)
+                self.add_link_record(record)
+
+    def add_link_record(self, record):
+        """
+        Add one link to the graph, the topology index and the host IPs.
+
+        The interfaces and ports of the link stay on its record, see `topology.get_link`.
+
+        Args:
+            record (Link_Record): The link.
+        """
+        node1, node2 = record.node1, record.node2
+        self.topology.add_link(record)
+        self._alt_path_finders.clear()  # Their landmark distances describe the old topology
 
-                # Add the   edge with the computed cost as the weight
-                self.graph.add_edge(node1, node2, delay=delay, bandwidth=bandwidth, loss=loss)
+        # Add the edge with its delay, bandwidth and loss
+        self.graph.add_edge(node1, node2, delay=record.delay, bandwidth=record.bandwidth, loss=record.loss)
 
-                # Store link details for the edge
-                self.link_details[(node1, node2)] = link_details
-                
-                # Store IP addresses for hosts
-                if node1.startswith('h'):  # If node1 is a host
-                    self.IPs[node1] = ip
-                if node2.startswith('h'):  # If node2 is a host
-                    self.IPs[node2] = ip
+        # Store IP addresses for hosts
+        if self.topology.is_host(node1):  # If node1 is a host
+            self.IPs[node1] = record.ip
+        if self.topology.is_host(node2):  # If node2 is a host
+            self.IPs[node2] = record.ip
 
     def categorize_nodes(self):
         """
-        Categorize nodes into switches and hosts based on their naming convention.
+        Categorize nodes into switches and hosts using the node types of the topology index.
         """
-        self.switches = [node for node in self.graph if node.startswith("s")]
-        self.hosts = [node for node in self.graph if node.startswith("h")]
+        self.switches = [node for node in self.graph if self.topology.is_switch(node)]
+        self.hosts = [node for node in self.graph if self.topology.is_host(node)]
 
     def dijkstra_path_findings(self, source, destination):
         """
@@ -109,32 +159,186 @@ class Network_Graph:
         except nx.NetworkXNoPath:
             return "No path found between the given nodes"
 
-    def visualize_graph(self):
+    def alt_path_finder(self, weight=None, landmark_count=8):
+        """
+        Return the landmark (ALT) point-to-point search engine of this topology.
+
+        The landmark distances are computed on first use and reused by every later query with the same
+        weight and landmark count, until `add_link_record` changes the topology.
+
+        Args:
+            weight (str): Edge attribute used as length, e.g. "delay". Default is None (hop count, as in
+                          `dijkstra_path_findings`).
+            landmark_count (int): Number of landmarks. Default is 8.
+
+        Returns:
+            ALT_Path_Finder: The engine; its `shortest_path` has the same cost as `nx.dijkstra_path`.
+        """
+        key = (weight, landmark_count)
+        if key not in self._alt_path_finders:
+            self._alt_path_finders[key] = ALT_Path_Finder(self, weight, landmark_count)
+        return self._alt_path_finders[key]
+
+    def topology_fingerprint(self):
+        """
+        Compute a fingerprint of the topology (nodes and links, not link properties).
+
+        Returns:
+            str: A hex digest that changes whenever a node or link is added or removed.
+        """
+        digest = hashlib.sha1()
+        for node in sorted(self.graph.nodes):
+            digest.update(f"{node};".encode())
+        for u, v in sorted(tuple(sorted(edge)) for edge in self.graph.edges):
+            digest.update(f"{u}-{v};".encode())
+        return digest.hexdigest()
+
+    def compute_layout(self, layout="auto"):
+        """
+        Compute node positions, reusing a cached result for the same topology and layout.
+
+        Args:
+            layout (str): One of:
+                - "spring": force-directed layout over the whole graph (slowest, the original behaviour).
+                - "switch_spring": force-directed layout over the switches only, hosts placed around their switch.
+                - "shell": switches on an inner ring, hosts on an outer ring (linear time).
+                - "circular": all nodes on one ring (linear time).
+                - "auto": "spring" for small graphs, "switch_spring" for medium ones and "shell" for very large ones.
+
+        Returns:
+            dict: Mapping of node to (x, y) position.
+
+        Raises:
+            ValueError: If `layout` is unknown.
+        """
+        if layout == "auto":
+            node_count = self.graph.number_of_nodes()
+            if node_count <= SMALL_GRAPH_NODE_LIMIT:
+                layout = "spring"
+            elif node_count <= LARGE_GRAPH_NODE_LIMIT:
+                layout = "switch_spring"
+            else:
+                layout = "shell"
+
+        key = (self.topology_fingerprint(), layout)
+        if key in _layout_cache:
+            _layout_cache.move_to_end(key)
+            return _layout_cache[key]
+
+        self.categorize_nodes()
+        if layout == "spring":
+            pos = nx.spring_layout(self.graph, seed=LAYOUT_SEED)
+        elif layout == "switch_spring":
+            pos = self._switch_spring_layout()
+        elif layout == "shell":
+            shells = [shell for shell in (self.switches, self.hosts) if shell]
+            pos = nx.shell_layout(self.graph, nlist=shells)
+        elif layout == "circular":
+            pos = nx.circular_layout(self.graph)
+        else:
+            raise ValueError(f"Unknown layout '{layout}'.")
+
+        _layout_cache[key] = pos
+        if len(_layout_cache) > LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+        return pos
+
+    def _switch_spring_layout(self):
+        """
+        Run the spring layout on the switch subgraph only and place every host on a small circle around its switch.
+
+        Hosts are degree-1 leaves, so leaving them out of the force simulation shrinks it to the switch count.
+
+        Returns:
+            dict: Mapping of node to (x, y) position.
+        """
+        switch_graph = self.graph.subgraph(self.switches)
+        pos = nx.spring_layout(switch_graph, seed=LAYOUT_SEED, iterations=30)
+        radius = 0.5 / max(len(self.switches), 1) ** 0.5
+
+        hosts_by_switch = {}
+        for host in self.hosts:
+            attached = [n for n in self.graph.neighbors(host) if n in pos]
+            hosts_by_switch.setdefault(attached[0] if attached else None, []).append(host)
+
+        for switch, hosts in hosts_by_switch.items():
+            center_x, center_y = pos[switch] if switch is not None else (0.0, 0.0)
+            for i, host in enumerate(hosts):
+                angle = 2 * math.pi * i / len(hosts)
+                pos[host] = (center_x + radius * math.cos(angle), center_y + radius * math.sin(angle))
+        return pos
+
+    def visualize_graph(self, output_file=None, layout="auto", edge_label_threshold=EDGE_LABEL_THRESHOLD):
         """
         Visualize the network graph with nodes categorized as switches and hosts.
+
+        Args:
+            output_file (str): If given, render off-screen with the Agg backend and write the figure to this path
+                               (PNG, SVG, ... following the file extension) instead of opening a window.
+            layout (str): Layout algorithm, see `compute_layout`. Default is "auto".
+            edge_label_threshold (int): Above this many links, per-edge labels are replaced by one aggregated
+                                        delay/bandwidth/loss summary in the title.
+        """
+        if output_file is None:
+            fig, ax = plt.subplots()
+            self._draw_graph(ax, layout, edge_label_threshold)
+            plt.show()
+            return
+
+        # Figure + Agg canvas never touches the GUI backend, so this is safe from worker threads
+        size = min(12 + self.graph.number_of_nodes() / 50, 40)
+        fig = Figure(figsize=(size, size * 0.75))
+        FigureCanvasAgg(fig)
+        ax = fig.add_subplot()
+        self._draw_graph(ax, layout, edge_label_threshold)
+        fig.savefig(output_file)
+        print(f"Network graph written to {output_file}")
+
+    def _draw_graph(self, ax, layout="auto", edge_label_threshold=EDGE_LABEL_THRESHOLD):
         """
-        pos = nx.spring_layout(self.graph)
+        Draw switches, hosts, edges, edge labels and the legend on the given axes.
+
+        Args:
+            ax (matplotlib.axes.Axes): The axes to draw on.
+            layout (str): Layout algorithm, see `compute_layout`.
+            edge_label_threshold (int): Maximum number of links that still get individual labels.
+        """
+        pos = self.compute_layout(layout)
         self.categorize_nodes()  # Get switches and hosts
-        nx.draw(self.graph, pos, nodelist=self.switches, with_labels=True, node_color='lightblue', node_size=3000)
-        nx.draw(self.graph, pos, nodelist=self.hosts, with_labels=True, node_color='lightgreen', node_size=1500)
-        nx.draw_networkx_edges(self.graph, pos)
-        
-        # Prepare edge labels (delay, bandwidth, loss)
-        edge_labels = {}
-        for u, v, data in self.graph.edges(data=True):
-            # You can format the label to display delay, bandwidth, and loss as needed
-            label = f"Delay: {data['delay']} ms\nBW: {data['bandwidth']} Mbps\nLoss: {data['loss']}%"
-            edge_labels[(u, v)] = label
+        small_graph = self.graph.number_of_nodes() <= SMALL_GRAPH_NODE_LIMIT
+        switch_size, host_size = (3000, 1500) if small_graph else (60, 20)
 
-        # Draw edge labels
-        nx.draw_networkx_edge_labels(self.graph, pos, edge_labels=edge_labels)
+        nx.draw_networkx_nodes(self.graph, pos, ax=ax, nodelist=self.switches, node_color='lightblue', node_size=switch_size)
+        nx.draw_networkx_nodes(self.graph, pos, ax=ax, nodelist=self.hosts, node_color='lightgreen', node_size=host_size)
+        nx.draw_networkx_edges(self.graph, pos, ax=ax, width=1.0 if small_graph else 0.3)
+        if small_graph:
+            nx.draw_networkx_labels(self.graph, pos, ax=ax)
+        ax.set_axis_off()
 
-        # Create a legend for switches and hosts
-        switch_patch = plt.Line2D([0], [0], marker='o', color='w', label='Switches', markerfacecolor='lightblue', markersize=10)
-        host_patch = plt.Line2D([0], [0], marker='o', color='w', label='Hosts', markerfacecolor='lightgreen', markersize=10)
-        plt.legend(handles=[switch_patch, host_patch])
+        if self.graph.number_of_edges() <= edge_label_threshold:
+            # Prepare edge labels (delay, bandwidth, loss)
+            edge_labels = {}
+            for u, v, data in self.graph.edges(data=True):
+                # You can format the label to display delay, bandwidth, and loss as needed
+                label = f"Delay: {data['delay']} ms\nBW: {data['bandwidth']} Mbps\nLoss: {data['loss']}%"
+                edge_labels[(u, v)] = label
+
+            # Draw edge labels
+            nx.draw_networkx_edge_labels(self.graph, pos, edge_labels=edge_labels, ax=ax)
+        else:
+            # Too many links to label individually: summarize them instead
+            delays = [data['delay'] for _, _, data in self.graph.edges(data=True)]
+            bandwidths = [data['bandwidth'] for _, _, data in self.graph.edges(data=True)]
+            losses = [data['loss'] for _, _, data in self.graph.edges(data=True)]
+            ax.set_title(f"{len(self.switches)} switches, {len(self.hosts)} hosts, {len(delays)} links | "
+                         f"delay {min(delays)}-{max(delays)} ms (avg {sum(delays) / len(delays):.1f}), "
+                         f"BW {min(bandwidths)}-{max(bandwidths)} Mbps, "
+                         f"loss avg {sum(losses) / len(losses):.2f}%")
 
-        plt.show()
+        # Create a legend for switches and hosts
+        switch_patch = Line2D([0], [0], marker='o', color='w', label='Switches', markerfacecolor='lightblue', markersize=10)
+        host_patch = Line2D([0], [0], marker='o', color='w', label='Hosts', markerfacecolor='lightgreen', markersize=10)
+        ax.legend(handles=[switch_patch, host_patch])
 
     def get_networkx_graph(self):
         return self.graph  # Return the internal NetworkX graph
@@ -1,38 +1,104 @@
 import numpy as np
 import random
+import heapq
 import networkx as nx
+from q_learning_jit import run_episodes
+from experience_replay import replay_update
+
+# Eligibility traces below this value are dropped from the per-episode trace dictionary
+TRACE_CUTOFF = 1e-4
 
 class QLearningPathFinder:
-    def __init__(self, network_graph):
-        self.graph = network_graph.get_networkx_graph()
+    def __init__(self, network_graph, switches_only=False, verbose=True):
+        """
+        Args:
+            network_graph (Network_Graph): The network to route over.
+            switches_only (bool): If True, train over the switch subgraph only. Hosts are degree-1 leaves, so
+                                  they are mapped to the switch they are attached to: a host goal becomes its
+                                  switch, with the access link's delay/bandwidth folded into the goal reward,
+                                  and `shortest_path` reattaches the host hops. Default is False.
+            verbose (bool): If False, reward initialization and `set_goal` do not print progress messages
+                            (`shortest_path` has its own `verbose` argument). Default is True.
+        """
+        self.verbose = verbose
+        self.full_graph = network_graph.get_networkx_graph()
+        self.switches_only = switches_only
+        self.host_to_switch = {}
+        if switches_only:
+            topology = network_graph.topology
+            for host in topology.hosts():
+                switches = [n for n in self.full_graph[host] if topology.is_switch(n)]
+                if switches:
+                    self.host_to_switch[host] = switches[0]
+            self.graph = self.full_graph.subgraph(topology.switches())
+        else:
+            self.graph = self.full_graph
         self.num_nodes = len(self.graph.nodes)
         self.R = np.full((self.num_nodes, self.num_nodes), -500)  # Default penalty for bad moves
         self.Q = np.zeros((self.num_nodes, self.num_nodes))
         self.node_to_index = {node: i for i, node in enumerate(self.graph.nodes)}
         self.index_to_node = {i: node for node, i in self.node_to_index.items()}
         self.goal_node = None  # Goal node to adjust rewards dynamically
+        self.goal_reward = None  # Reward of the step into the goal, as stored in R
         self._initialize_rewards()
+        self._build_edge_arrays()
+
+    @staticmethod
+    def _edge_reward(data):
+        """Reward of moving along an edge with the given delay/bandwidth attributes."""
+        return 100 - data['delay'] - (1 / data['bandwidth'])
 
     def _initialize_rewards(self):
-        print("Initializing rewards...")
+        if self.verbose:
+            print("Initializing rewards...")
         for node in self.graph.nodes:
             for neighbor in self.graph[node]:
-                delay = self.graph[node][neighbor]['delay']
-                bandwidth = self.graph[node][neighbor]['bandwidth']
                 node_index = self.node_to_index[node]
                 neighbor_index = self.node_to_index[neighbor]
 
                 # Normal reward calculation (avoid negative infinite rewards)
-                self.R[node_index, neighbor_index] = 100 - delay - (1 / bandwidth)
+                self.R[node_index, neighbor_index] = self._edge_reward(self.graph[node][neighbor])
                 # print(f"Reward from {node} to {neighbor}: {self.R[node_index, neighbor_index]}")
 
+    def _build_edge_arrays(self):
+        """
+        Store the directed edge list in CSR form: the neighbors of node i are
+        `edge_dst[indptr[i]:indptr[i + 1]]`, and `edge_src` repeats i for each of them.
+        """
+        degrees = [len(self.graph[self.index_to_node[i]]) for i in range(self.num_nodes)]
+        self.indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        self.indptr[1:] = np.cumsum(degrees)
+        self.edge_dst = np.fromiter((self.node_to_index[neighbor]
+                                     for i in range(self.num_nodes)
+                                     for neighbor in self.graph[self.index_to_node[i]]),
+                                    dtype=np.int64, count=int(self.indptr[-1]))
+        self.edge_src = np.repeat(np.arange(self.num_nodes, dtype=np.int64), degrees)
+
+    def _state_node(self, node):
+        """Return the node that represents `node` in the state space (its switch when hosts are collapsed)."""
+        return self.host_to_switch.get(node, node)
+
     def set_goal(self, goal_node):
         """Increase reward for reaching the goal."""
+        # With collapsed hosts, the goal is the host's switch minus the cost of the last (access) hop
+        access_penalty = 0
+        if goal_node in self.host_to_switch:
+            access_link = self.full_graph[goal_node][self.host_to_switch[goal_node]]
+            access_penalty = access_link['delay'] + (1 / access_link['bandwidth'])
+            goal_node = self.host_to_switch[goal_node]
         if goal_node in self.node_to_index:
+            if self.goal_node is not None and self.goal_node != goal_node:
+                # Restore the normal rewards of the previous goal before moving it
+                previous_index = self.node_to_index[self.goal_node]
+                self.R[:, previous_index] = -500
+                for neighbor in self.graph[self.goal_node]:
+                    self.R[self.node_to_index[neighbor], previous_index] = self._edge_reward(self.graph[neighbor][self.goal_node])
             self.goal_node = goal_node
             goal_index = self.node_to_index[goal_node]
-            self.R[:, goal_index] = 1000  # Huge reward for reaching the goal
-            print(f"Set goal node: {goal_node} (index: {goal_index})")
+            self.R[:, goal_index] = 1000 - access_penalty  # Huge reward for reaching the goal
+            self.goal_reward = self.R[goal_index, goal_index]
+            if self.verbose:
+                print(f"Set goal node: {goal_node} (index: {goal_index})")
 
     def next_node(self, start, exploration_rate):
         if start not in self.graph:
@@ -58,14 +124,97 @@ class QLearningPathFinder:
         # print(f"Updating Q-value from {node1} to {node2}: {self.Q[node1_index, node2_index]} -> {new_q_value}")
         self.Q[node1_index, node2_index] = new_q_value
 
-    def learn(self, start, end, exploration_rate, learning_rate, discount_factor, episodes):
-        """Train the Q-learning model from start to end."""
+    def _is_greedy(self, node1, node2):
+        """Whether moving from node1 to node2 takes a maximal Q-value among node1's neighbors."""
+        row = self.Q[self.node_to_index[node1]]
+        return row[self.node_to_index[node2]] >= max(row[self.node_to_index[n]] for n in self.graph.neighbors(node1))
+
+    def trace_update_Q(self, node1, node2, traces, learning_rate, discount_factor, trace_decay):
+        """
+        One step of Watkins's Q(lambda).
+
+        The TD error of the move is the one `update_Q` uses, but it is applied to every (state, action) pair
+        still in `traces`, weighted by its eligibility, so the goal reward flows back along the whole greedy
+        part of the episode at once. The move's own trace is set to 1 (replacing traces) and all traces then
+        decay by discount_factor * trace_decay. The caller clears `traces` after an exploratory move, since
+        the earlier moves are no longer followed by the greedy policy.
+
+        Args:
+            node1 (str): The current node.
+            node2 (str): The chosen neighbor.
+            traces (dict): Eligibility per (node1 index, node2 index) of the current episode, updated in place.
+            learning_rate (float): Learning rate.
+            discount_factor (float): Discount factor.
+            trace_decay (float): lambda, between 0 and 1.
+        """
+        node1_index = self.node_to_index[node1]
+        node2_index = self.node_to_index[node2]
+        td_error = self.R[node1_index, node2_index] + discount_factor * np.max(self.Q[node2_index]) - \
+                   self.Q[node1_index, node2_index]
+        traces[(node1_index, node2_index)] = 1.0
+        decay = discount_factor * trace_decay
+        for pair, eligibility in list(traces.items()):
+            self.Q[pair] += learning_rate * td_error * eligibility
+            eligibility *= decay
+            if eligibility < TRACE_CUTOFF:
+                del traces[pair]
+            else:
+                traces[pair] = eligibility
+
+    def learn(self, start, end, exploration_rate, learning_rate, discount_factor, episodes, backend="python", seed=None,
+              replay=None, replay_batch_size=32, replay_updates=1, trace_decay=0.0):
+        """
+        Train the Q-learning model from start to end.
+
+        Args:
+            backend (str): "python" runs the episodes in the interpreter with the `random` module.
+                           "compiled" runs whole episodes in `q_learning_jit.run_episodes` over the CSR arrays,
+                           compiled with Numba when it is installed (pure Python otherwise). Its Q-table is
+                           reproducible bit for bit for a given seed, compiled or not.
+            seed (int): Seed of the "compiled" backend's random number generator. Default is a random seed.
+            replay (Replay_Memory): If given ("python" backend only), every transition is also stored in this
+                                    replay memory and, after each step, `replay_updates` batched Bellman updates
+                                    of `replay_batch_size` sampled transitions are applied (see
+                                    `experience_replay.replay_update`), so the goal reward spreads backward many
+                                    hops per episode. The memory is cleared when the goal or its reward
+                                    changes (two hosts on the same switch share the goal state, but not the
+                                    access penalty of the goal reward).
+            replay_batch_size (int): Transitions per replay update. Default is 32.
+            replay_updates (int): Replay updates per environment step. Default is 1.
+            trace_decay (float): lambda of Watkins's Q(lambda) ("python" backend only). If above 0, every step
+                                 also updates the earlier greedy steps of the episode through eligibility traces
+                                 kept in a per-episode dict of the visited edges (see `trace_update_Q`);
+                                 0 is plain one-step Q-learning. Default is 0.0.
+
+        Returns:
+            float: The exploration rate after the last episode.
+        """
+        previous_goal = (self.goal_node, self.goal_reward)
         self.set_goal(end)  # Set goal reward before training
+        start, end = self._state_node(start), self._state_node(end)
+
+        if backend == "compiled":
+            if replay is not None:
+                raise ValueError("Experience replay needs the \"python\" backend.")
+            if trace_decay:
+                raise ValueError("Eligibility traces need the \"python\" backend.")
+            if seed is None:
+                seed = random.getrandbits(32)
+            self.Q = np.ascontiguousarray(self.Q, dtype=np.float64)
+            return float(run_episodes(self.indptr, self.edge_dst, self.Q, self.R, self.node_to_index[start],
+                                      self.node_to_index[end], exploration_rate, learning_rate, discount_factor,
+                                      episodes, seed))
+        if backend != "python":
+            raise ValueError(f"Unknown backend '{backend}'.")
+        if replay is not None and previous_goal != (self.goal_node, self.goal_reward):
+            replay.clear()  # Stored rewards belong to the previous goal
+        end_index = self.node_to_index[end]
 
         for episode in range(episodes):
             # print(f"\nEpisode {episode + 1}/{episodes}")
             current_node = start
             visited_nodes = set()
+            traces = {}
 
             while True:
                 visited_nodes.add(current_node)
@@ -73,7 +222,18 @@ class QLearningPathFinder:
                 if next_node is None or next_node in visited_nodes:
                     # print(f"Stopping episode: No valid next node from {current_node}")
                     break
-                self.update_Q(current_node, next_node, learning_rate, discount_factor)
+                if trace_decay:
+                    if not self._is_greedy(current_node, next_node):
+                        traces.clear()  # Watkins: an exploratory move cuts the traces
+                    self.trace_update_Q(current_node, next_node, traces, learning_rate, discount_factor, trace_decay)
+                else:
+                    self.update_Q(current_node, next_node, learning_rate, discount_factor)
+                if replay is not None:
+                    state, action = self.node_to_index[current_node], self.node_to_index[next_node]
+                    replay.add(state, action, self.R[state, action], action, action == end_index)
+                    if len(replay) >= replay_batch_size:
+                        for _ in range(replay_updates):
+                            replay_update(self.Q, replay, replay_batch_size, learning_rate, discount_factor)
                 current_node = next_node
                 if current_node == end:
                     # print(f"Reached goal node: {end}")
@@ -82,9 +242,231 @@ class QLearningPathFinder:
             if exploration_rate > 0.01:
                 exploration_rate *= 0.99  # Reduce exploration over time
             # print(f"Updated exploration rate: {exploration_rate}")
+        return exploration_rate
+
+    def plan(self, end, discount_factor=0.9, method="synchronous", tolerance=1e-6, max_sweeps=1000):
+        """
+        Compute the Q-table directly from the known reward model instead of sampling episodes.
+
+        Every step reward is positive, so over the whole graph the Bellman fixed point would value cycles
+        through neighbors, which episodes cannot take (they end on revisiting a node). Planning is therefore
+        restricted to progress moves: edges to a neighbor strictly closer to the goal by the link cost
+        delay + 1/bandwidth (one Dijkstra pass from the goal, see `_goal_distances`). These edges form an
+        acyclic graph, so every planned path is simple and the value iteration
+            V[a] = max(0, max over progress moves (a, b) of R[a, b] + discount_factor * V[b]),   V[end] = 0
+        is exact and converges in at most (longest progress path + 1) sweeps. Progress moves get
+        Q[s, a] = R[s, a] + discount_factor * V[a]; other moves get R[s, a] alone, since they have no planned
+        continuation. The 0 floor matches `update_Q`, which takes the maximum over a full Q row, and the
+        goal's own row stays 0, as in training, where episodes end at the goal. The greedy path then reaches
+        the goal from every node connected to it.
+
+        Args:
+            end (str): The goal node.
+            discount_factor (float): Discount applied to future rewards. Default is 0.9.
+            method (str): "synchronous" updates every edge at once per sweep (vectorized over the edge list);
+                          "prioritized" (prioritized sweeping) only revisits nodes whose successors changed.
+            tolerance (float): Stop once no node value changes by more than this. Default is 1e-6.
+            max_sweeps (int): Upper bound on full sweeps (or on updates / num_nodes for prioritized sweeping).
+
+        Returns:
+            int: The number of sweeps performed; for prioritized sweeping, node updates divided by num_nodes.
+
+        Raises:
+            ValueError: If `end` is not in the graph or `method` is unknown.
+        """
+        if self._state_node(end) not in self.node_to_index:
+            raise ValueError(f"Unknown goal node '{end}'.")
+        self.set_goal(end)
+        goal_index = self.node_to_index[self.goal_node]
+        edge_rewards = self.R[self.edge_src, self.edge_dst].astype(float)
+        distances, _ = self._goal_distances(goal_index)
+        progress = distances[self.edge_dst] < distances[self.edge_src]
+        # Non-progress moves never win a backup
+        progress_rewards = np.where(progress, edge_rewards, -np.inf)
+
+        if method == "synchronous":
+            V = np.zeros(self.num_nodes)
+            sweeps = 0
+            while sweeps < max_sweeps:
+                sweeps += 1
+                new_V = np.zeros(self.num_nodes)
+                np.maximum.at(new_V, self.edge_src, progress_rewards + discount_factor * V[self.edge_dst])
+                new_V[goal_index] = 0.0
+                delta = np.max(np.abs(new_V - V)) if self.num_nodes else 0.0
+                V = new_V
+                if delta <= tolerance:
+                    break
+        elif method == "prioritized":
+            V, updates = self._prioritized_sweeping(progress_rewards, distances, goal_index, discount_factor,
+                                                    tolerance, max_sweeps * max(self.num_nodes, 1))
+            sweeps = int(np.ceil(updates / max(self.num_nodes, 1)))
+        else:
+            raise ValueError(f"Unknown planning method '{method}'.")
 
-    def shortest_path(self, start, end):
+        self.Q = np.zeros((self.num_nodes, self.num_nodes))
+        self.Q[self.edge_src, self.edge_dst] = edge_rewards + np.where(progress, discount_factor * V[self.edge_dst], 0.0)
+        self.Q[goal_index] = 0.0
+        return sweeps
+
+    def _goal_distances(self, goal_index):
+        """
+        Run Dijkstra from the goal over the link cost delay + 1/bandwidth (the part of the edge reward that
+        varies between links). The graph is undirected, so this is the distance of every node to the goal.
+
+        Returns:
+            tuple: (distances, parent): distance per node index (inf when not connected to the goal), and the
+                   mapping of every reached node index to its next hop toward the goal (None for the goal).
+                   The mapping is ordered by distance, so a node's next hop always comes before it.
+        """
+        costs = np.fromiter((data['delay'] + 1 / data['bandwidth']
+                             for i in range(self.num_nodes)
+                             for data in self.graph[self.index_to_node[i]].values()),
+                            dtype=float, count=int(self.indptr[-1]))
+        distances = np.full(self.num_nodes, np.inf)
+        distances[goal_index] = 0.0
+        candidates = {goal_index: None}
+        parent = {}
+        heap = [(0.0, goal_index)]
+        while heap:
+            distance, node = heapq.heappop(heap)
+            if node in parent:
+                continue
+            parent[node] = candidates[node]
+            for k in range(self.indptr[node], self.indptr[node + 1]):
+                neighbor = int(self.edge_dst[k])
+                candidate = distance + costs[k]
+                if neighbor not in parent and candidate < distances[neighbor]:
+                    distances[neighbor] = candidate
+                    candidates[neighbor] = node
+                    heapq.heappush(heap, (candidate, neighbor))
+        return distances, parent
+
+    def initialize_from_shortest_paths(self, end, discount_factor=0.9, prior=None, prior_weight=0.5):
+        """
+        Seed the Q-table from one shortest-path pass toward the goal, so training starts near a good policy.
+
+        A Dijkstra search from the goal over the link cost delay + 1/bandwidth (the part of the edge reward
+        that varies between links) gives every node its next hop toward the goal. Following those next hops
+        under the reward model gives each node a value
+            V[v] = max(0, R[v, next_hop(v)] + discount_factor * V[next_hop(v)]),   V[end] = 0
+        and every edge is seeded with Q[s, a] = R[s, a] + discount_factor * V[a], the same form `plan` uses.
+        If s lies on a's own path to the goal (e.g. a is a host leaf behind s), that path would revisit s,
+        which ends an episode, so such moves get R[s, a] alone. The greedy policy therefore starts as the
+        shortest-path tree improved by one step of lookahead, moves towards the goal have positive Q-values
+        for `next_node` to exploit, and `learn` only has to refine them. The goal's own row stays 0, as in
+        training, where episodes end at the goal.
+
+        Args:
+            end (str): The goal node.
+            discount_factor (float): Discount factor; use the one training will use. Default is 0.9.
+            prior (np.ndarray or list): Optional Q-table(s) of the same shape, e.g. from earlier training
+                                        towards the same goal, blended in as their mean.
+            prior_weight (float): Weight of the prior tables in the blend, between 0 and 1. Default is 0.5.
+
+        Returns:
+            np.ndarray: The node values V used for the seed.
+
+        Raises:
+            ValueError: If `end` is not in the graph or a prior table has the wrong shape.
+        """
+        if self._state_node(end) not in self.node_to_index:
+            raise ValueError(f"Unknown goal node '{end}'.")
+        self.set_goal(end)
+        goal_index = self.node_to_index[self.goal_node]
+
+        # parent[v] is v's next hop toward the goal; nodes come in order of distance, so a node's next hop
+        # always has its value already
+        _, parent = self._goal_distances(goal_index)
+        V = np.zeros(self.num_nodes)
+        for node, hop in parent.items():
+            if hop is not None:
+                V[node] = max(0.0, self.R[node, hop] + discount_factor * V[hop])
+
+        # Entry/exit times of a depth-first walk of the shortest-path tree: s is on a's path to the goal
+        # exactly when s is an ancestor of a
+        children = {}
+        for node, hop in parent.items():
+            if hop is not None:
+                children.setdefault(hop, []).append(node)
+        entry = np.full(self.num_nodes, -1, dtype=np.int64)
+        leave = np.full(self.num_nodes, -1, dtype=np.int64)
+        clock = 0
+        stack = [(goal_index, False)]
+        while stack:
+            node, done = stack.pop()
+            if done:
+                leave[node] = clock
+            else:
+                entry[node] = clock
+                stack.append((node, True))
+                stack.extend((child, False) for child in children.get(node, ()))
+            clock += 1
+        src, dst = self.edge_src, self.edge_dst
+        revisits = (entry[src] >= 0) & (entry[src] <= entry[dst]) & (leave[dst] <= leave[src])
+
+        Q = np.zeros((self.num_nodes, self.num_nodes))
+        Q[src, dst] = self.R[src, dst] + np.where(revisits, 0.0, discount_factor * V[dst])
+        Q[goal_index] = 0.0
+        if prior is not None:
+            priors = [prior] if isinstance(prior, np.ndarray) else list(prior)
+            for table in priors:
+                if np.shape(table) != Q.shape:
+                    raise ValueError(f"Prior Q-table has shape {np.shape(table)}, expected {Q.shape}.")
+            Q = (1 - prior_weight) * Q + prior_weight * np.mean(priors, axis=0)
+        self.Q = Q
+        return V
+
+    def _prioritized_sweeping(self, edge_rewards, distances, goal_index, discount_factor, tolerance, max_updates):
+        """
+        Solve for V with prioritized sweeping: always back up the node with the largest pending change.
+
+        `edge_rewards` holds -inf for the moves `plan` excludes; a node's value only depends on its neighbors
+        closer to the goal, so only its neighbors farther from the goal (by `distances`) are re-queued.
+
+        Returns:
+            tuple: (V, number of node backups performed).
+        """
+        V = np.zeros(self.num_nodes)
+
+        def backup(node):
+            if node == goal_index:
+                return 0.0
+            start, stop = self.indptr[node], self.indptr[node + 1]
+            if start == stop:
+                return 0.0
+            return max(0.0, float(np.max(edge_rewards[start:stop] + discount_factor * V[self.edge_dst[start:stop]])))
+
+        # Initial residuals of every node, computed in one vectorized pass
+        initial = np.zeros(self.num_nodes)
+        np.maximum.at(initial, self.edge_src, edge_rewards)
+        initial[goal_index] = 0.0
+        heap = [(-residual, node) for node, residual in enumerate(initial) if residual > tolerance]
+        heapq.heapify(heap)
+
+        updates = 0
+        while heap and updates < max_updates:
+            _, node = heapq.heappop(heap)
+            new_value = backup(node)
+            change = abs(new_value - V[node])
+            updates += 1
+            if change <= tolerance:
+                continue
+            V[node] = new_value
+            # Only the predecessors of `node` (its neighbors farther from the goal) can change
+            priority = discount_factor * change
+            if priority <= tolerance:
+                continue
+            for predecessor in self.edge_dst[self.indptr[node]:self.indptr[node + 1]]:
+                if distances[predecessor] > distances[node]:
+                    heapq.heappush(heap, (-priority, int(predecessor)))
+        return V, updates
+
+    def shortest_path(self, start, end, verbose=True):
         """Finds the best path using the learned Q-table."""
+        if start not in self.full_graph or end not in self.full_graph:
+            return "Invalid nodes"
+        host_start, host_end = start, end
+        start, end = self._state_node(start), self._state_node(end)
         if start not in self.graph or end not in self.graph:
             return "Invalid nodes"
 
@@ -97,7 +479,8 @@ class QLearningPathFinder:
 
             neighbors = list(self.graph.neighbors(current_node))
             if not neighbors:
-                print(f"No neighbors for {current_node}. Ending pathfinding.")
+                if verbose:
+                    print(f"No neighbors for {current_node}. Ending pathfinding.")
                 return "No neighbors"
 
             # Find the neighbor with the highest Q-value that is not in the path
@@ -113,19 +496,28 @@ class QLearningPathFinder:
 
             if best_neighbor:
                 path.append(best_neighbor)
-                print(f"Added {best_neighbor} to path (Q-value: {best_q_value})")
+                if verbose:
+                    print(f"Added {best_neighbor} to path (Q-value: {best_q_value})")
             else:
-                print(f"No valid next node from {current_node}. Ending pathfinding.")
+                if verbose:
+                    print(f"No valid next node from {current_node}. Ending pathfinding.")
                 return "No valid path found"
 
-        print(f"Final path: {path}")
+        # Reattach the collapsed host hops
+        if host_start != start:
+            path.insert(0, host_start)
+        if host_end != end:
+            path.append(host_end)
+
+        if verbose:
+            print(f"Final path: {path}")
         return path
 
     def evaluate_path(self, path):
         if len(path) < 2:
             return 0, 0
-        total_delay = sum(self.graph[u][v]['delay'] for u, v in zip(path[:-1], path[1:]))
-        min_bandwidth = min(self.graph[u][v]['bandwidth'] for u, v in zip(path[:-1], path[1:]))
+        total_delay = sum(self.full_graph[u][v]['delay'] for u, v in zip(path[:-1], path[1:]))
+        min_bandwidth = min(self.full_graph[u][v]['bandwidth'] for u, v in zip(path[:-1], path[1:]))
         return total_delay, min_bandwidth
 
     def compare_with_dijkstra(self, start, end):
@@ -134,7 +526,7 @@ class QLearningPathFinder:
         q_delay, q_bandwidth = self.evaluate_path(q_path) if isinstance(q_path, list) else (None, None)
 
         try:
-            d_path = nx.dijkstra_path(self.graph, start, end, weight='delay')
+            d_path = nx.dijkstra_path(self.full_graph, start, end, weight='delay')
             d_delay, d_bandwidth = self.evaluate_path(d_path)
         except nx.NetworkXNoPath:
             d_path, d_delay, d_bandwidth = "No path", None, None
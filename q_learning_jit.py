@@ -0,0 +1,104 @@
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+# Any non-zero 32-bit value works as xorshift state; used when the seed is 0
+_DEFAULT_STATE = 0x9E3779B9
+_MASK_32 = 0xFFFFFFFF
+
+
+def _xorshift32(state):
+    """Advance a 32-bit xorshift generator. Uses only int64 arithmetic so Python and Numba agree bit for bit."""
+    state ^= (state << 13) & _MASK_32
+    state ^= state >> 17
+    state ^= (state << 5) & _MASK_32
+    return state
+
+
+def _run_episodes(indptr, indices, Q, R, start, end, exploration_rate, learning_rate, discount_factor, episodes, seed):
+    """
+    Run Q-learning episodes over a CSR adjacency, updating Q in place.
+
+    The control flow is the one of `QLearningPathFinder.learn`: epsilon-greedy moves, episodes stop at the
+    goal, at an already visited node or when no neighbor has a positive Q-value, and the exploration rate
+    decays by 1% per episode down to 0.01. Random numbers come from a seeded xorshift32 generator, so the
+    same seed gives the same Q-table whether or not this function is compiled.
+
+    Args:
+        indptr (np.ndarray): CSR row pointers (int64), the neighbors of i are indices[indptr[i]:indptr[i + 1]].
+        indices (np.ndarray): CSR neighbor indices (int64).
+        Q (np.ndarray): The Q-table (float64, num_nodes x num_nodes), updated in place.
+        R (np.ndarray): The reward matrix, with the goal reward already set.
+        start (int): Index of the start node.
+        end (int): Index of the goal node.
+        exploration_rate (float): Initial exploration rate.
+        learning_rate (float): Learning rate.
+        discount_factor (float): Discount factor.
+        episodes (int): Number of episodes.
+        seed (int): Seed of the random number generator.
+
+    Returns:
+        float: The exploration rate after the last episode.
+    """
+    num_nodes = indptr.shape[0] - 1
+    state = seed & _MASK_32
+    if state == 0:
+        state = _DEFAULT_STATE
+    # visited[i] == episode + 1 marks node i as visited in the current episode, so it never needs clearing
+    visited = np.zeros(num_nodes, dtype=np.int64)
+
+    for episode in range(episodes):
+        stamp = episode + 1
+        current = start
+        while True:
+            visited[current] = stamp
+            first, last = indptr[current], indptr[current + 1]
+            if first == last:
+                break
+
+            state = _xorshift32(state)
+            if state / 4294967296.0 < exploration_rate:
+                state = _xorshift32(state)
+                next_node = indices[first + state % (last - first)]
+            else:
+                next_node = indices[first]
+                best_q = Q[current, next_node]
+                for k in range(first + 1, last):
+                    if Q[current, indices[k]] > best_q:
+                        next_node = indices[k]
+                        best_q = Q[current, next_node]
+                if best_q <= 0:
+                    break
+
+            if visited[next_node] == stamp:
+                break
+
+            # max over the full Q row: only edges are ever updated and Q[i, i] stays 0, so the row maximum
+            # is the neighbor maximum floored at 0
+            max_future_value = 0.0
+            for k in range(indptr[next_node], indptr[next_node + 1]):
+                if Q[next_node, indices[k]] > max_future_value:
+                    max_future_value = Q[next_node, indices[k]]
+            Q[current, next_node] = (1 - learning_rate) * Q[current, next_node] + \
+                learning_rate * (R[current, next_node] + discount_factor * max_future_value)
+
+            current = next_node
+            if current == end:
+                break
+
+        if exploration_rate > 0.01:
+            exploration_rate *= 0.99
+    return exploration_rate
+
+
+run_episodes_python = _run_episodes
+
+if NUMBA_AVAILABLE:
+    _xorshift32 = njit(cache=True)(_xorshift32)
+    run_episodes = njit(cache=True)(_run_episodes)
+else:
+    run_episodes = _run_episodes
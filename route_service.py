@@ -0,0 +1,422 @@
+from networkx_graph import Network_Graph
+from q_learning import QLearningPathFinder
+from flow_rules import path_flow_commands
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, urlencode
+from urllib.request import urlopen, Request
+import argparse
+import bisect
+import json
+import threading
+import time
+
+ALGORITHMS = ("dijkstra", "alt", "q_learning")
+
+# Upper bounds (in milliseconds) of the latency histogram buckets; the last bucket is unbounded
+LATENCY_BUCKETS_MS = (0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+class LRU_Cache:
+    """
+    A thread-safe, bounded least-recently-used cache.
+
+    Attributes:
+        capacity (int): Maximum number of entries kept in the cache.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that were not in the cache.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        """
+        Initialize the cache.
+
+        Args:
+            capacity (int): Maximum number of entries. Default is 1024.
+
+        Raises:
+            ValueError: If `capacity` is less than 1.
+        """
+        if capacity < 1:
+            raise ValueError("Cache capacity must be at least 1.")
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Return the value stored for `key` and mark it as most recently used.
+
+        Args:
+            key: The cache key.
+            default: Value returned when the key is not cached.
+
+        Returns:
+            The cached value, or `default`.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key, value):
+        """
+        Store `value` for `key`, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: The cache key.
+            value: The value to store.
+        """
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Remove every entry from the cache."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """
+        Returns:
+            dict: Size, capacity, hits and misses of the cache.
+        """
+        with self._lock:
+            return {"size": len(self._entries), "capacity": self.capacity, "hits": self.hits, "misses": self.misses}
+
+
+class Latency_Histogram:
+    """
+    A thread-safe latency histogram with fixed millisecond buckets.
+
+    Attributes:
+        buckets (tuple): Upper bounds of the buckets in milliseconds.
+        counts (list): Number of observations per bucket; the last entry counts observations above every bound.
+        count (int): Total number of observations.
+        total_ms (float): Sum of all observations in milliseconds.
+    """
+
+    def __init__(self, buckets=LATENCY_BUCKETS_MS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, latency_ms: float):
+        """
+        Record one observation.
+
+        Args:
+            latency_ms (float): The observed latency in milliseconds.
+        """
+        with self._lock:
+            self.counts[bisect.bisect_left(self.buckets, latency_ms)] += 1
+            self.count += 1
+            self.total_ms += latency_ms
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: Observation count, sum, mean and per-bucket counts keyed by their upper bound.
+        """
+        with self._lock:
+            labels = [f"le_{bound}" for bound in self.buckets] + ["inf"]
+            return {
+                "count": self.count,
+                "sum_ms": self.total_ms,
+                "mean_ms": self.total_ms / self.count if self.count else 0.0,
+                "buckets": dict(zip(labels, self.counts)),
+            }
+
+
+class Route_Query_Service:
+    """
+    Answer route queries against a topology that stays loaded in memory.
+
+    The service keeps the `Network_Graph` and the trained `QLearningPathFinder` models resident, serves
+    repeated queries from a bounded LRU cache and invalidates cached routes whenever the topology changes:
+    every cache key includes the topology version (the topology fingerprint plus a reload counter).
+
+    Attributes:
+        csv_file (str): Path to the topology CSV file.
+        nx_graph (Network_Graph): The loaded network graph.
+        topology_version (str): Version of the loaded topology, part of every cache key.
+        route_cache (LRU_Cache): Cache of computed routes.
+        q_models (LRU_Cache): Trained Q-learning models, keyed by (topology_version, source, dest).
+        latency (dict): Mapping of endpoint name to its Latency_Histogram.
+    """
+
+    def __init__(self, csv_file: str = "network_topology.csv", cache_size: int = 1024, max_q_models: int = 32,
+                 exploration_rate=1.0, learning_rate=0.6, discount_factor=0.9, learn_episodes=20000):
+        """
+        Initialize the service and load the topology.
+
+        Args:
+            csv_file (str): Path to the topology CSV file. Default is "network_topology.csv".
+            cache_size (int): Maximum number of cached routes. Default is 1024.
+            max_q_models (int): Maximum number of trained Q-learning models kept in memory. Default is 32.
+            exploration_rate, learning_rate, discount_factor, learn_episodes: Q-learning training parameters.
+        """
+        self.csv_file = csv_file
+        self.training_parameters = (exploration_rate, learning_rate, discount_factor, learn_episodes)
+        self.route_cache = LRU_Cache(cache_size)
+        self.q_models = LRU_Cache(max_q_models)
+        self.latency = {}
+        self._reloads = 0
+        self._lock = threading.Lock()
+        self._training_lock = threading.Lock()
+        self.nx_graph = None
+        self.topology_version = None
+        self.load_topology()
+
+    def load_topology(self, csv_file: str = None):
+        """
+        (Re)load the topology and drop every cached route and model of the previous topology.
+
+        Args:
+            csv_file (str): Path to a new topology CSV file. Default is the current one.
+
+        Returns:
+            str: The new topology version.
+        """
+        with self._lock:
+            if csv_file is not None:
+                self.csv_file = csv_file
+            self.nx_graph = Network_Graph(self.csv_file)
+            self._reloads += 1
+            self.topology_version = f"{self.nx_graph.topology_fingerprint()[:12]}-{self._reloads}"
+            self.route_cache.clear()
+            self.q_models.clear()
+            return self.topology_version
+
+    def _observe(self, endpoint: str, latency_ms: float):
+        with self._lock:
+            histogram = self.latency.setdefault(endpoint, Latency_Histogram())
+        histogram.observe(latency_ms)
+
+    def _q_learning_model(self, version, nx_graph, source, dest):
+        """
+        Return a Q-learning model trained for (source, dest), training it on first use.
+        """
+        key = (version, source, dest)
+        model = self.q_models.get(key)
+        if model is not None:
+            return model
+        with self._training_lock:
+            # Another request may have trained the same model while this one waited
+            model = self.q_models.get(key)
+            if model is None:
+                exploration_rate, learning_rate, discount_factor, learn_episodes = self.training_parameters
+                model = QLearningPathFinder(nx_graph, verbose=False)
+                model.learn(source, dest, exploration_rate, learning_rate, discount_factor, learn_episodes)
+                self.q_models.put(key, model)
+        return model
+
+    def query(self, source: str, dest: str, algorithm: str = "dijkstra", include_flow_rules: bool = False):
+        """
+        Compute (or fetch from the cache) the route between two nodes.
+
+        Args:
+            source (str): The source node.
+            dest (str): The destination node.
+            algorithm (str): "dijkstra" (fewest hops), "alt" (least delay, landmark A* search) or "q_learning".
+                             Default is "dijkstra".
+            include_flow_rules (bool): If True, include the ovs-ofctl commands for the path. Default is False.
+
+        Returns:
+            dict: The route with keys "source", "dest", "algorithm", "path", "delay", "bandwidth",
+                  "topology_version", "cached" and, if requested, "flow_rules". "path" is None when no path exists.
+
+        Raises:
+            ValueError: If the algorithm is unknown or a node is not in the topology.
+        """
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Unknown algorithm '{algorithm}', expected one of {ALGORITHMS}.")
+        with self._lock:
+            nx_graph, version = self.nx_graph, self.topology_version
+        for node in (source, dest):
+            if node not in nx_graph.graph:
+                raise ValueError(f"Unknown node '{node}'.")
+
+        key = (version, source, dest, algorithm)
+        route = self.route_cache.get(key)
+        cached = route is not None
+        if route is None:
+            if algorithm == "dijkstra":
+                path = nx_graph.dijkstra_path_findings(source, dest)
+            elif algorithm == "alt":
+                path = nx_graph.alt_path_finder(weight='delay').shortest_path(source, dest)
+            else:
+                path = self._q_learning_model(version, nx_graph, source, dest).shortest_path(source, dest, verbose=False)
+            if not isinstance(path, list):
+                path = None
+
+            delay, bandwidth = (None, None)
+            if path is not None and len(path) > 1:
+                edges = list(zip(path[:-1], path[1:]))
+                delay = sum(nx_graph.graph[u][v]['delay'] for u, v in edges)
+                bandwidth = min(nx_graph.graph[u][v]['bandwidth'] for u, v in edges)
+            route = {"source": source, "dest": dest, "algorithm": algorithm, "path": path,
+                     "delay": delay, "bandwidth": bandwidth, "topology_version": version}
+            self.route_cache.put(key, route)
+
+        result = dict(route, cached=cached)
+        if include_flow_rules:
+            result["flow_rules"] = list(path_flow_commands(nx_graph, route["path"])) if route["path"] else []
+        return result
+
+    def metrics(self):
+        """
+        Returns:
+            dict: Topology version, cache statistics and per-endpoint latency histograms.
+        """
+        with self._lock:
+            histograms = dict(self.latency)
+        return {
+            "topology_version": self.topology_version,
+            "route_cache": self.route_cache.stats(),
+            "q_models": self.q_models.stats(),
+            "latency": {endpoint: histogram.to_dict() for endpoint, histogram in histograms.items()},
+        }
+
+
+class _Route_Request_Handler(BaseHTTPRequestHandler):
+    """
+    HTTP front end of a Route_Query_Service.
+
+    Endpoints:
+        GET  /route?source=h0&dest=h9&algorithm=dijkstra&flow_rules=1
+        GET  /metrics
+        POST /topology/reload   (optional JSON body: {"csv_file": "..."})
+    """
+
+    service = None  # Set by make_server
+
+    def _send_json(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _handle(self, endpoint, handler):
+        start_time = time.perf_counter()
+        try:
+            self._send_json(200, handler())
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+        except Exception as e:
+            self._send_json(500, {"error": str(e)})
+        finally:
+            self.service._observe(endpoint, (time.perf_counter() - start_time) * 1000)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        if url.path == "/route":
+            self._handle("route", lambda: self.service.query(
+                params.get("source", ""), params.get("dest", ""), params.get("algorithm", "dijkstra"),
+                params.get("flow_rules", "0").lower() in ("1", "true", "yes")))
+        elif url.path == "/metrics":
+            self._handle("metrics", self.service.metrics)
+        else:
+            self._send_json(404, {"error": f"Unknown endpoint '{url.path}'."})
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        if url.path != "/topology/reload":
+            self._send_json(404, {"error": f"Unknown endpoint '{url.path}'."})
+            return
+
+        def reload():
+            # Parsed inside _handle, so a malformed body is answered with a 400 error
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            if not isinstance(body, dict):
+                raise ValueError("The request body must be a JSON object.")
+            return {"topology_version": self.service.load_topology(body.get("csv_file"))}
+
+        self._handle("reload", reload)
+
+    def log_message(self, format, *args):
+        pass  # Keep the console quiet; latency is tracked in the histograms instead
+
+
+def make_server(service: Route_Query_Service, host: str = "127.0.0.1", port: int = 8080):
+    """
+    Create a threaded HTTP server for a route query service.
+
+    Args:
+        service (Route_Query_Service): The service answering the queries.
+        host (str): Interface to bind. Default is "127.0.0.1".
+        port (int): Port to bind; 0 picks a free port. Default is 8080.
+
+    Returns:
+        ThreadingHTTPServer: The server; call `serve_forever()` to start it.
+    """
+    handler = type("Route_Request_Handler", (_Route_Request_Handler,), {"service": service})
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def query_route(base_url: str, source: str, dest: str, algorithm: str = "dijkstra", flow_rules: bool = False,
+                timeout: float = 600):
+    """
+    Query a running route service.
+
+    Args:
+        base_url (str): URL of the service, e.g. "http://127.0.0.1:8080".
+        source (str): The source node.
+        dest (str): The destination node.
+        algorithm (str): "dijkstra", "alt" or "q_learning". Default is "dijkstra".
+        flow_rules (bool): If True, ask for the flow rules of the path. Default is False.
+        timeout (float): Request timeout in seconds. Q-learning queries train on first use. Default is 600.
+
+    Returns:
+        dict: The decoded JSON response.
+    """
+    query = urlencode({"source": source, "dest": dest, "algorithm": algorithm, "flow_rules": int(flow_rules)})
+    with urlopen(f"{base_url.rstrip('/')}/route?{query}", timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+def reload_topology(base_url: str, csv_file: str = None, timeout: float = 60):
+    """
+    Ask a running route service to reload its topology.
+
+    Returns:
+        dict: The decoded JSON response with the new topology version.
+    """
+    body = json.dumps({"csv_file": csv_file} if csv_file else {}).encode()
+    request = Request(f"{base_url.rstrip('/')}/topology/reload", data=body, method="POST",
+                      headers={"Content-Type": "application/json"})
+    with urlopen(request, timeout=timeout) as response:
+        return json.loads(response.read())
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve route queries over HTTP.")
+    parser.add_argument("--topology", default="network_topology.csv", help="topology CSV file")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--cache-size", type=int, default=1024)
+    parser.add_argument("--learn-episodes", type=int, default=20000)
+    args = parser.parse_args()
+
+    server = make_server(Route_Query_Service(args.topology, cache_size=args.cache_size,
+                                             learn_episodes=args.learn_episodes), args.host, args.port)
+    print(f"Serving route queries on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
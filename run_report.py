@@ -0,0 +1,235 @@
+import contextlib
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+MB = 1024 * 1024
+
+# Seconds between two samples of the resident set size while stages are open
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+def _rss_mb():
+    """
+    Returns:
+        float: Current resident set size of the process in MB, or None where unknown (no /proc).
+    """
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / MB
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _process_rss_peak_mb():
+    """
+    Returns:
+        float: Peak resident set size over the whole life of the process in MB, or None where unknown.
+    """
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+class Run_Report:
+    """
+    Per-stage wall time, CPU time and memory of a run.
+
+    Stages are recorded with the `stage` context manager and may be nested; a nested stage is named
+    "<parent>/<child>". Nesting is tracked per thread, so stages running in worker threads (the path finding
+    thread of `run`, the blocking stages of the async pipeline) are recorded side by side.
+
+    Every stage records:
+        - wall_s: elapsed wall-clock time.
+        - cpu_s: CPU time of the thread that ran the stage (child processes such as Mininet are not included).
+        - concurrent: whether a stage of another thread was open at some point during the stage.
+        - python_peak_mb: peak memory allocated by Python during the stage (tracemalloc), only when memory
+          tracing is on. tracemalloc counts the whole process and its peak can only be reset process-wide,
+          so it is None for concurrent stages.
+        - rss_mb / rss_peak_mb: resident set size of the process at the end of the stage, and the largest
+          resident set size sampled during the stage (every RSS_SAMPLE_INTERVAL seconds by a background
+          thread, and at the start and end of the stage), so short spikes between samples can be missed.
+          RSS is process-wide too: for concurrent stages it includes the memory of the other stages.
+        - process_rss_peak_mb: peak resident set size over the whole life of the process so far (ru_maxrss),
+          not of the stage.
+
+    Attributes:
+        name (str): Name of the run.
+        trace_memory (bool): Whether tracemalloc peaks are recorded.
+        metadata (dict): Free-form run parameters (topology size, source, destination, ...).
+        stages (list): The stage records, in completion order.
+    """
+
+    def __init__(self, name="run", trace_memory=False):
+        """
+        Args:
+            name (str): Name of the run. Default is "run".
+            trace_memory (bool): If True, record Python allocation peaks with tracemalloc. This slows down
+                                 allocation-heavy stages, so it is off by default. Default is False.
+        """
+        self.name = name
+        self.trace_memory = trace_memory
+        self.metadata = {}
+        self.stages = []
+        self.started_at = time.strftime("%Y-%m-%dT%H:%M:%S")
+        self._start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._open = {}  # id of the open stage records -> (thread ident, record)
+        self._sampler = None
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    def add_metadata(self, **values):
+        with self._lock:
+            self.metadata.update(values)
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    def _sample_rss(self):
+        """Background loop: raise the RSS peak of every open stage, until no stage is open."""
+        while True:
+            time.sleep(RSS_SAMPLE_INTERVAL)
+            rss = _rss_mb()
+            with self._lock:
+                if not self._open:
+                    self._sampler = None
+                    return
+                if rss is not None:
+                    for _, record in self._open.values():
+                        record["_rss_peak"] = max(record["_rss_peak"], rss)
+
+    def _open_stage(self, record):
+        """Register an open stage, mark it and the open stages of other threads as concurrent if they overlap."""
+        thread = threading.get_ident()
+        with self._lock:
+            for other_thread, other in self._open.values():
+                if other_thread != thread:
+                    other["concurrent"] = record["concurrent"] = True
+            self._open[id(record)] = (thread, record)
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sample_rss, name="run-report-rss", daemon=True)
+                self._sampler.start()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """
+        Record one stage.
+
+        Args:
+            name (str): Name of the stage.
+
+        Yields:
+            dict: The stage record; callers may add their own fields.
+        """
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        rss = _rss_mb()
+        record = {"name": f"{parent['name']}/{name}" if parent else name,
+                  "thread": threading.current_thread().name,
+                  "start_s": round(time.perf_counter() - self._start, 6),
+                  "concurrent": False,
+                  "_rss_peak": rss if rss is not None else 0.0}
+        self._open_stage(record)
+        tracing = self.trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            # reset_peak() would hide the parent's peak so far, so hand it to the parent first. The reset is
+            # process-wide: it also clears the peak of stages open in other threads, which are concurrent anyway.
+            peak = tracemalloc.get_traced_memory()[1]
+            if parent is not None:
+                parent["_peak"] = max(parent["_peak"], peak)
+            tracemalloc.reset_peak()
+            record["_peak"] = 0
+        stack.append(record)
+        wall_start, cpu_start = time.perf_counter(), time.thread_time()
+        try:
+            yield record
+            record["status"] = "ok"
+        except BaseException as e:
+            record["status"] = f"error: {type(e).__name__}"
+            raise
+        finally:
+            record["wall_s"] = round(time.perf_counter() - wall_start, 6)
+            record["cpu_s"] = round(time.thread_time() - cpu_start, 6)
+            stack.pop()
+            rss = _rss_mb()
+            with self._lock:
+                del self._open[id(record)]
+                rss_peak = max(record.pop("_rss_peak"), rss) if rss is not None else None
+            if tracing:
+                peak = max(record.pop("_peak"), tracemalloc.get_traced_memory()[1])
+                record["python_peak_mb"] = None if record["concurrent"] else round(peak / MB, 3)
+                if parent is not None:
+                    parent["_peak"] = max(parent["_peak"], peak)
+            record["rss_mb"] = round(rss, 3) if rss is not None else None
+            record["rss_peak_mb"] = round(rss_peak, 3) if rss_peak is not None else None
+            process_peak = _process_rss_peak_mb()
+            record["process_rss_peak_mb"] = round(process_peak, 3) if process_peak is not None else None
+            with self._lock:
+                self.stages.append(record)
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: The report: run name, start time, total wall time, metadata and the stages ordered by start.
+        """
+        with self._lock:
+            stages = sorted(self.stages, key=lambda record: record["start_s"])
+            metadata = dict(self.metadata)
+        return {
+            "run": self.name,
+            "started_at": self.started_at,
+            "total_wall_s": round(time.perf_counter() - self._start, 6),
+            "trace_memory": self.trace_memory,
+            "metadata": metadata,
+            "stages": stages,
+        }
+
+    def to_json(self, indent=2):
+        return json.dumps(self.to_dict(), indent=indent, default=str)
+
+    def write(self, output_file):
+        """
+        Write the report as a JSON document.
+
+        Args:
+            output_file (str): Path of the JSON file.
+        """
+        with open(output_file, "w") as file:
+            file.write(self.to_json() + "\n")
+        print(f"Run report written to {output_file}")
+
+    def append_to_metrics_file(self, metrics_file):
+        """
+        Append the report as one JSON line, so successive runs can be compared over time.
+
+        Args:
+            metrics_file (str): Path of the JSONL metrics file; created if needed.
+        """
+        with open(metrics_file, "a") as file:
+            file.write(json.dumps(self.to_dict(), default=str) + "\n")
+        print(f"Run report appended to {metrics_file}")
+
+    def summary(self):
+        """
+        Returns:
+            str: One line per stage with its wall time, CPU time and memory, ordered by start.
+        """
+        lines = [f"{'stage':<55} {'wall s':>9} {'cpu s':>9} {'py peak MB':>11} {'rss MB':>9} {'rss peak MB':>12}"]
+        for record in self.to_dict()["stages"]:
+            peak = record.get("python_peak_mb")
+            lines.append(f"{record['name']:<55} {record['wall_s']:>9.3f} {record['cpu_s']:>9.3f} "
+                         f"{peak if peak is not None else '-':>11} {record['rss_mb'] if record['rss_mb'] is not None else '-':>9} "
+                         f"{record['rss_peak_mb'] if record['rss_peak_mb'] is not None else '-':>12}")
+        return "\n".join(lines)
@@ -0,0 +1,210 @@
+from array import array
+
+# Node types, stored as one signed byte per node in Topology_Index.node_types
+SWITCH = 0
+HOST = 1
+OTHER = -1
+
+
+def node_type_of(name: str) -> int:
+    """
+    Classify a node by the project's naming convention ("s<i>" switches, "h<i>" hosts).
+
+    Args:
+        name (str): The node name.
+
+    Returns:
+        int: SWITCH, HOST or OTHER.
+    """
+    if name.startswith("s"):
+        return SWITCH
+    if name.startswith("h"):
+        return HOST
+    return OTHER
+
+
+def parse_port(interface_name: str):
+    """
+    Extract the port number from a Mininet interface name.
+
+    Args:
+        interface_name (str): e.g. "s3-eth12".
+
+    Returns:
+        int: The port number (12 for "s3-eth12"), or None if the name has no "-eth<number>" suffix.
+    """
+    _, _, port = interface_name.strip().rpartition("-eth")
+    return int(port) if port.isdigit() else None
+
+
+class Link_Record:
+    """
+    One link of the topology, with its interfaces already parsed into port numbers.
+
+    Attributes:
+        node1 (str): The first node of the link.
+        node2 (str): The second node of the link.
+        intf1 (str): Interface name on node1 (e.g. "h0-eth0"), or None if unknown.
+        intf2 (str): Interface name on node2 (e.g. "s0-eth1"), or None if unknown.
+        port1 (int): Port number of intf1, or None.
+        port2 (int): Port number of intf2, or None.
+        delay (float): Delay in ms, or None.
+        bandwidth (float): Bandwidth in Mbps, or None.
+        loss (float): Packet loss in percent, or None.
+        ip (str): IP address of the host end of the link, or None.
+    """
+    __slots__ = ("node1", "node2", "intf1", "intf2", "port1", "port2", "delay", "bandwidth", "loss", "ip")
+
+    def __init__(self, node1, node2, intf1=None, intf2=None, delay=None, bandwidth=None, loss=None, ip=None):
+        self.node1 = node1
+        self.node2 = node2
+        self.intf1 = intf1
+        self.intf2 = intf2
+        self.port1 = parse_port(intf1) if intf1 else None
+        self.port2 = parse_port(intf2) if intf2 else None
+        self.delay = delay
+        self.bandwidth = bandwidth
+        self.loss = loss
+        self.ip = ip
+
+    @classmethod
+    def from_link_details(cls, node1, node2, link_details, **properties):
+        """
+        Build a record from the CSV "Link Details" column, e.g. "h0-eth0, s0-eth1".
+
+        The interface that starts with "<node1>-" belongs to node1, whatever the column order.
+        """
+        intf1, _, intf2 = (part.strip() for part in link_details.partition(","))
+        if intf2.startswith(f"{node1}-") and not intf1.startswith(f"{node1}-"):
+            intf1, intf2 = intf2, intf1
+        return cls(node1, node2, intf1 or None, intf2 or None, **properties)
+
+    @property
+    def link_details(self):
+        """str: The interfaces in the CSV "Link Details" format."""
+        return f"{self.intf1}, {self.intf2}"
+
+    def port_of(self, node):
+        """
+        Args:
+            node (str): One end of the link.
+
+        Returns:
+            int: The port number of the link on `node`, or None.
+        """
+        if node == self.node1:
+            return self.port1
+        if node == self.node2:
+            return self.port2
+        return None
+
+    def other(self, node):
+        """Return the end of the link opposite to `node`."""
+        return self.node2 if node == self.node1 else self.node1
+
+    def __repr__(self):
+        return (f"Link_Record({self.node1!r}, {self.node2!r}, {self.intf1!r}, {self.intf2!r}, "
+                f"delay={self.delay!r}, bandwidth={self.bandwidth!r}, loss={self.loss!r}, ip={self.ip!r})")
+
+
+class Topology_Index:
+    """
+    Topology lookup index shared by the network, graph and Q-learning modules.
+
+    Node names are interned to dense integer IDs with their type in a byte array, so node classification does
+    not depend on name prefixes at every call site, and every link is kept once as a Link_Record with its
+    parsed ports, found in constant time from either end.
+
+    Attributes:
+        names (list): Node name per ID.
+        ids (dict): Mapping of node name to ID.
+        node_types (array): Node type (SWITCH, HOST, OTHER) per ID.
+        links (list): Link_Record per link index.
+    """
+
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+        self.node_types = array("b")
+        self.links = []
+        self._link_by_pair = {}
+
+    def intern(self, name: str) -> int:
+        """
+        Return the ID of a node, assigning the next free ID on first use.
+
+        Args:
+            name (str): The node name.
+
+        Returns:
+            int: The node ID.
+        """
+        node_id = self.ids.get(name)
+        if node_id is None:
+            node_id = len(self.names)
+            self.ids[name] = node_id
+            self.names.append(name)
+            self.node_types.append(node_type_of(name))
+        return node_id
+
+    def _pair(self, node1, node2):
+        u, v = self.ids.get(node1), self.ids.get(node2)
+        if u is None or v is None:
+            return None
+        return (u, v) if u <= v else (v, u)
+
+    def add_link(self, record: Link_Record) -> int:
+        """
+        Add a link, or update the properties of an existing link between the same nodes.
+
+        Args:
+            record (Link_Record): The link.
+
+        Returns:
+            int: The link index.
+        """
+        u, v = self.intern(record.node1), self.intern(record.node2)
+        pair = (u, v) if u <= v else (v, u)
+        index = self._link_by_pair.get(pair)
+        if index is None:
+            index = len(self.links)
+            self._link_by_pair[pair] = index
+            self.links.append(record)
+        else:
+            self.links[index] = record
+        return index
+
+    def get_link(self, node1, node2):
+        """
+        Args:
+            node1 (str): One end of the link.
+            node2 (str): The other end of the link.
+
+        Returns:
+            Link_Record: The link between the two nodes in either direction, or None.
+        """
+        pair = self._pair(node1, node2)
+        index = self._link_by_pair.get(pair) if pair is not None else None
+        return self.links[index] if index is not None else None
+
+    def node_type(self, name):
+        """Return SWITCH, HOST or OTHER for a node, falling back to the naming convention for unknown names."""
+        node_id = self.ids.get(name)
+        return self.node_types[node_id] if node_id is not None else node_type_of(name)
+
+    def is_switch(self, name):
+        return self.node_type(name) == SWITCH
+
+    def is_host(self, name):
+        return self.node_type(name) == HOST
+
+    def switches(self):
+        """list: Names of all switches, in ID order."""
+        return [name for name, node_type in zip(self.names, self.node_types) if node_type == SWITCH]
+
+    def hosts(self):
+        """list: Names of all hosts, in ID order."""
+        return [name for name, node_type in zip(self.names, self.node_types) if node_type == HOST]
+
+    def __len__(self):
+        return len(self.names)
@@ -0,0 +1,338 @@
+import argparse
+import csv
+import time
+import numpy as np
+from topology_core import Link_Record
+
+CSV_FIELDNAMES = ["Node1", "Node2", "Link Details", "IP Address", "Delay(ms)", "Bandwidth", "Loss"]
+
+
+def host_ip(host_index):
+    """
+    Address of the host with the given index: 254 hosts per /24, so 10k+ hosts stay valid.
+
+    Args:
+        host_index (int): The host index (the number in "h<i>").
+
+    Returns:
+        str: The IP address without netmask, e.g. "10.0.0.1" for h0.
+    """
+    subnet, offset = divmod(host_index, 254)
+    return f"10.{subnet // 256 % 256}.{subnet % 256}.{offset + 1}"
+
+
+class Link_Attributes:
+    """
+    Distributions of the delay, bandwidth and loss of generated links.
+
+    Every attribute is one of:
+        - a number: the same value for every link.
+        - a tuple (low, high): uniform between the bounds, integers if both bounds are integers.
+        - a list: uniform choice among the values.
+        - a callable(rng, size): returns `size` values drawn with the NumPy generator `rng`.
+
+    Delay and bandwidth are rounded to integers, since `Mininet_Network.load_network_from_csv` reads them as
+    integers. The defaults are the distributions of the host links of `Mininet_Network`.
+
+    Attributes:
+        delay: Delay distribution in ms.
+        bandwidth: Bandwidth distribution in Mbps.
+        loss: Packet loss distribution in percent.
+    """
+
+    def __init__(self, delay=(1, 20), bandwidth=None, loss=(0.0, 2.0)):
+        self.delay = delay
+        self.bandwidth = bandwidth if bandwidth is not None else [10, 50, 100, 1000]
+        self.loss = loss
+
+    @staticmethod
+    def _sample(distribution, rng, size):
+        if callable(distribution):
+            return np.asarray(distribution(rng, size), dtype=float)
+        if isinstance(distribution, tuple):
+            low, high = distribution
+            if isinstance(low, int) and isinstance(high, int):
+                return rng.integers(low, high + 1, size).astype(float)
+            return rng.uniform(low, high, size)
+        if isinstance(distribution, list):
+            return rng.choice(np.asarray(distribution, dtype=float), size)
+        return np.full(size, float(distribution))
+
+    def sample(self, rng, size):
+        """
+        Draw the properties of `size` links at once.
+
+        Args:
+            rng (np.random.Generator): The generator.
+            size (int): Number of links.
+
+        Returns:
+            tuple: (delay, bandwidth, loss) lists of length `size`.
+        """
+        delay = np.rint(self._sample(self.delay, rng, size)).astype(int)
+        bandwidth = np.rint(self._sample(self.bandwidth, rng, size)).astype(int)
+        loss = np.round(self._sample(self.loss, rng, size), 2)
+        return delay.tolist(), bandwidth.tolist(), loss.tolist()
+
+
+class Topology_Builder:
+    """
+    Assemble a topology as Link_Records, without creating any Mininet objects.
+
+    Nodes follow the project's naming ("s<i>" switches, "h<i>" hosts) and interfaces Mininet's: hosts use
+    "h<i>-eth0", switch ports are numbered from 1 in the order links are added, so the records round-trip
+    through the CSV "Link Details" column. Every link belongs to a tier (e.g. "host", "leaf_spine"), and each
+    tier can have its own Link_Attributes.
+
+    Attributes:
+        link_attributes (dict): Link_Attributes per tier; tiers not in it use `default_attributes`.
+        default_attributes (Link_Attributes): Distributions of tiers without their own.
+        switch_count (int): Number of switches added.
+        host_count (int): Number of hosts added.
+    """
+
+    def __init__(self, link_attributes=None, seed=None):
+        """
+        Args:
+            link_attributes (Link_Attributes or dict): Distributions for every tier, or a mapping of tier to
+                                                      distributions. Default is `Link_Attributes()`.
+            seed (int): Seed of the attribute generator.
+        """
+        if isinstance(link_attributes, dict):
+            self.link_attributes = dict(link_attributes)
+            self.default_attributes = Link_Attributes()
+        else:
+            self.link_attributes = {}
+            self.default_attributes = link_attributes if link_attributes is not None else Link_Attributes()
+        self.rng = np.random.default_rng(seed)
+        self.switch_count = 0
+        self.host_count = 0
+        self._next_port = {}
+        self._host_ips = {}
+        self._links = []  # (node1, node2, intf1, intf2, tier)
+
+    def add_switch(self):
+        """Add a switch and return its name."""
+        name = f"s{self.switch_count}"
+        self.switch_count += 1
+        self._next_port[name] = 1
+        return name
+
+    def add_switches(self, count):
+        """Add `count` switches and return their names."""
+        return [self.add_switch() for _ in range(count)]
+
+    def add_host(self, switch, tier="host"):
+        """
+        Add a host attached to `switch` and return its name.
+
+        Args:
+            switch (str): The switch the host is attached to.
+            tier (str): Tier of the host link. Default is "host".
+        """
+        name = f"h{self.host_count}"
+        self.host_count += 1
+        self._next_port[name] = 0
+        self._host_ips[name] = host_ip(self.host_count - 1)
+        self.add_link(name, switch, tier)
+        return name
+
+    def add_link(self, node1, node2, tier):
+        """
+        Add a link between two nodes, taking the next free port on both.
+
+        Args:
+            node1 (str): The first node.
+            node2 (str): The second node.
+            tier (str): Tier of the link.
+        """
+        port1, port2 = self._next_port[node1], self._next_port[node2]
+        self._next_port[node1] = port1 + 1
+        self._next_port[node2] = port2 + 1
+        self._links.append((node1, node2, f"{node1}-eth{port1}", f"{node2}-eth{port2}", tier))
+
+    def link_records(self):
+        """
+        Draw the link properties, per tier, and return the links.
+
+        Returns:
+            list: Link_Record per link, in the order the links were added; host links carry the host's IP.
+        """
+        rows_by_tier = {}
+        for row, link in enumerate(self._links):
+            rows_by_tier.setdefault(link[4], []).append(row)
+        properties = [None] * len(self._links)
+        for tier, rows in rows_by_tier.items():
+            attributes = self.link_attributes.get(tier, self.default_attributes)
+            for row, values in zip(rows, zip(*attributes.sample(self.rng, len(rows)))):
+                properties[row] = values
+
+        records = []
+        for (node1, node2, intf1, intf2, _), (delay, bandwidth, loss) in zip(self._links, properties):
+            ip = self._host_ips.get(node1) or self._host_ips.get(node2)
+            records.append(Link_Record(node1, node2, intf1, intf2, delay=delay, bandwidth=bandwidth, loss=loss, ip=ip))
+        return records
+
+
+def fat_tree(k=4, hosts_per_edge=None, link_attributes=None, seed=None):
+    """
+    Generate a k-ary fat-tree.
+
+    There are k pods of k/2 edge and k/2 aggregation switches, every edge switch is linked to every
+    aggregation switch of its pod, and aggregation switch j of every pod is linked to core switches
+    j*k/2 .. (j+1)*k/2 - 1 of the (k/2)^2 cores. Switches are numbered core first, then aggregation and edge
+    per pod. k=32 gives 1280 switches, 8192 hosts and 24576 links.
+
+    Args:
+        k (int): Switch radix, even and at least 2. Default is 4.
+        hosts_per_edge (int): Hosts per edge switch. Default is k/2.
+        link_attributes (Link_Attributes or dict): Distributions, optionally per tier ("host",
+                                                  "edge_aggregation", "aggregation_core").
+        seed (int): Seed of the link attributes.
+
+    Returns:
+        list: The links as Link_Records.
+
+    Raises:
+        ValueError: If k is odd or less than 2.
+    """
+    if k < 2 or k % 2:
+        raise ValueError("k must be an even number of at least 2.")
+    half = k // 2
+    hosts_per_edge = half if hosts_per_edge is None else hosts_per_edge
+    builder = Topology_Builder(link_attributes, seed)
+    cores = builder.add_switches(half * half)
+    pods = [(builder.add_switches(half), builder.add_switches(half)) for _ in range(k)]
+    for aggregations, edges in pods:
+        for edge in edges:
+            for _ in range(hosts_per_edge):
+                builder.add_host(edge)
+            for aggregation in aggregations:
+                builder.add_link(edge, aggregation, "edge_aggregation")
+        for j, aggregation in enumerate(aggregations):
+            for core in cores[j * half:(j + 1) * half]:
+                builder.add_link(aggregation, core, "aggregation_core")
+    return builder.link_records()
+
+
+def leaf_spine(spines=4, leaves=8, hosts_per_leaf=4, link_attributes=None, seed=None):
+    """
+    Generate a two-tier leaf-spine fabric: every leaf is linked to every spine.
+
+    Switches are numbered spines first, then leaves.
+
+    Args:
+        spines (int): Number of spine switches. Default is 4.
+        leaves (int): Number of leaf switches. Default is 8.
+        hosts_per_leaf (int): Hosts per leaf switch. Default is 4.
+        link_attributes (Link_Attributes or dict): Distributions, optionally per tier ("host", "leaf_spine").
+        seed (int): Seed of the link attributes.
+
+    Returns:
+        list: The links as Link_Records.
+
+    Raises:
+        ValueError: If there are no spines or no leaves.
+    """
+    if spines < 1 or leaves < 1:
+        raise ValueError("A leaf-spine fabric needs at least one spine and one leaf.")
+    builder = Topology_Builder(link_attributes, seed)
+    spine_switches = builder.add_switches(spines)
+    for leaf in builder.add_switches(leaves):
+        for _ in range(hosts_per_leaf):
+            builder.add_host(leaf)
+        for spine in spine_switches:
+            builder.add_link(leaf, spine, "leaf_spine")
+    return builder.link_records()
+
+
+def torus(rows=4, columns=4, hosts_per_switch=1, link_attributes=None, seed=None):
+    """
+    Generate a 2D torus: a rows x columns grid of switches whose rows and columns wrap around.
+
+    Switch (r, c) is "s<r * columns + c>". A dimension of size 2 has no separate wrap-around link (it would
+    duplicate the grid link), and a dimension of size 1 has no links.
+
+    Args:
+        rows (int): Number of rows. Default is 4.
+        columns (int): Number of columns. Default is 4.
+        hosts_per_switch (int): Hosts per switch. Default is 1.
+        link_attributes (Link_Attributes or dict): Distributions, optionally per tier ("host", "switch").
+        seed (int): Seed of the link attributes.
+
+    Returns:
+        list: The links as Link_Records.
+
+    Raises:
+        ValueError: If rows or columns is less than 1.
+    """
+    if rows < 1 or columns < 1:
+        raise ValueError("A torus needs at least one row and one column.")
+    builder = Topology_Builder(link_attributes, seed)
+    switches = builder.add_switches(rows * columns)
+    for switch in switches:
+        for _ in range(hosts_per_switch):
+            builder.add_host(switch)
+    for r in range(rows):
+        for c in range(columns):
+            switch = switches[r * columns + c]
+            if columns > 2 or (columns == 2 and c == 0):
+                builder.add_link(switch, switches[r * columns + (c + 1) % columns], "switch")
+            if rows > 2 or (rows == 2 and r == 0):
+                builder.add_link(switch, switches[(r + 1) % rows * columns + c], "switch")
+    return builder.link_records()
+
+
+def write_topology_csv(records, csv_file="network_topology.csv"):
+    """
+    Save generated links in the topology CSV format of `Mininet_Network.save_network_to_csv`.
+
+    The file can be loaded by `Network_Graph`, `Mininet_Network.load_network_from_csv` and every tool that
+    takes a topology CSV.
+
+    Args:
+        records (iterable): Link_Records.
+        csv_file (str): Path of the CSV file. Default is "network_topology.csv".
+    """
+    with open(csv_file, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDNAMES)
+        writer.writeheader()
+        for record in records:
+            writer.writerow({
+                "Node1": record.node1,
+                "Node2": record.node2,
+                "Link Details": record.link_details,
+                "IP Address": record.ip if record.ip is not None else "N/A",
+                "Delay(ms)": record.delay if record.delay is not None else "N/A",
+                "Bandwidth": record.bandwidth if record.bandwidth is not None else "N/A",
+                "Loss": record.loss if record.loss is not None else "N/A",
+            })
+    print(f"Network saved to {csv_file}")
+
+
+GENERATORS = {"fat-tree": fat_tree, "leaf-spine": leaf_spine, "torus": torus}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a structured datacenter topology CSV.")
+    parser.add_argument("shape", choices=sorted(GENERATORS))
+    parser.add_argument("--k", type=int, default=4, help="fat-tree radix")
+    parser.add_argument("--spines", type=int, default=4, help="leaf-spine spine switches")
+    parser.add_argument("--leaves", type=int, default=8, help="leaf-spine leaf switches")
+    parser.add_argument("--rows", type=int, default=4, help="torus rows")
+    parser.add_argument("--columns", type=int, default=4, help="torus columns")
+    parser.add_argument("--hosts", type=int, help="hosts per edge/leaf/torus switch (default: k/2, 4 and 1)")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", default="network_topology.csv")
+    args = parser.parse_args()
+
+    start_time = time.time()
+    if args.shape == "fat-tree":
+        records = fat_tree(args.k, args.hosts, seed=args.seed)
+    elif args.shape == "leaf-spine":
+        records = leaf_spine(args.spines, args.leaves, 4 if args.hosts is None else args.hosts, seed=args.seed)
+    else:
+        records = torus(args.rows, args.columns, 1 if args.hosts is None else args.hosts, seed=args.seed)
+    node_count = len({node for record in records for node in (record.node1, record.node2)})
+    print(f"Generated {args.shape} with {node_count} nodes and {len(records)} links in {time.time() - start_time:.2f} seconds")
+    write_topology_csv(records, args.output)
@@ -0,0 +1,232 @@
+import numpy as np
+import networkx as nx
+
+# Utilization at which the queueing delay estimate stops growing (avoids dividing by zero at saturation)
+MAX_QUEUE_UTILIZATION = 0.99
+
+
+def uniform_traffic_matrix(hosts, demand=1.0):
+    """
+    Build a traffic matrix with the same demand between every ordered pair of distinct hosts.
+
+    Args:
+        hosts (list): Host names.
+        demand (float): Demand of every flow in Mbps. Default is 1.0.
+
+    Returns:
+        dict: Mapping of (source, destination) to demand.
+    """
+    return {(source, dest): demand for source in hosts for dest in hosts if source != dest}
+
+
+def random_traffic_matrix(hosts, flow_count, demand_range=(1.0, 10.0), seed=None):
+    """
+    Build a traffic matrix of random host pairs with uniformly distributed demands.
+
+    Pairs drawn more than once have their demands summed.
+
+    Args:
+        hosts (list): Host names.
+        flow_count (int): Number of flows to draw.
+        demand_range (tuple): (low, high) demand in Mbps. Default is (1.0, 10.0).
+        seed (int): Seed for reproducible matrices.
+
+    Returns:
+        dict: Mapping of (source, destination) to demand.
+    """
+    if len(hosts) < 2:
+        raise ValueError("At least two hosts are needed to build a traffic matrix.")
+    rng = np.random.default_rng(seed)
+    sources = rng.integers(0, len(hosts), flow_count)
+    offsets = rng.integers(1, len(hosts), flow_count)  # never equal to the source
+    demands = rng.uniform(demand_range[0], demand_range[1], flow_count)
+    matrix = {}
+    for source, offset, demand in zip(sources, offsets, demands):
+        pair = (hosts[source], hosts[(source + offset) % len(hosts)])
+        matrix[pair] = matrix.get(pair, 0.0) + float(demand)
+    return matrix
+
+
+class Traffic_Simulator:
+    """
+    Estimate link load, delay and loss of a routing under a traffic matrix.
+
+    Links are full duplex, so each direction of a link is modeled separately with the link's bandwidth as
+    its capacity. Routes are turned into a sparse flow x link incidence (COO arrays of flow index, link index
+    and the fraction of the flow's demand carried), and every quantity is then computed for all flows and
+    links at once with `np.bincount`.
+
+    Attributes:
+        graph (nx.Graph): The network graph.
+        links (list): Directed links (u, v), indexed like the arrays below.
+        capacity (np.ndarray): Bandwidth of each directed link in Mbps.
+        delay (np.ndarray): Propagation delay of each directed link in ms.
+        loss (np.ndarray): Loss probability of each directed link (0-1).
+    """
+
+    def __init__(self, network_graph):
+        """
+        Args:
+            network_graph (Network_Graph): The network to simulate.
+        """
+        self.graph = network_graph.get_networkx_graph()
+        self.links = []
+        for u, v in self.graph.edges:
+            self.links.append((u, v))
+            self.links.append((v, u))
+        self.link_index = {link: i for i, link in enumerate(self.links)}
+        self.capacity = np.array([self.graph[u][v]['bandwidth'] for u, v in self.links], dtype=float)
+        self.delay = np.array([self.graph[u][v]['delay'] for u, v in self.links], dtype=float)
+        self.loss = np.array([self.graph[u][v]['loss'] for u, v in self.links], dtype=float) / 100
+
+    def _route_function(self, routing):
+        """
+        Turn a routing specification into a function (source, dest) -> [(path, fraction), ...].
+        """
+        if callable(routing):
+            return lambda source, dest: self._normalize_routes(routing(source, dest))
+        if isinstance(routing, dict):
+            return lambda source, dest: self._normalize_routes(routing.get((source, dest)))
+        if routing in ("dijkstra", "hops"):
+            weight = 'delay' if routing == "dijkstra" else None
+            predecessors_by_source = {}
+
+            def route(source, dest):
+                # One single-source pass serves every flow leaving the same source; only the requested
+                # paths are walked back from the predecessor tree
+                if source not in predecessors_by_source:
+                    predecessors_by_source[source] = nx.dijkstra_predecessor_and_distance(
+                        self.graph, source, weight=weight)[0]
+                predecessors = predecessors_by_source[source]
+                if dest not in predecessors:
+                    return []
+                path = [dest]
+                while path[-1] != source:
+                    path.append(predecessors[path[-1]][0])
+                path.reverse()
+                return [(path, 1.0)]
+            return route
+        if routing == "ecmp":
+            def route(source, dest):
+                try:
+                    paths = list(nx.all_shortest_paths(self.graph, source, dest, weight='delay'))
+                except nx.NetworkXNoPath:
+                    return []
+                return [(path, 1.0 / len(paths)) for path in paths]
+            return route
+        raise ValueError(f"Unknown routing '{routing}'.")
+
+    @staticmethod
+    def _normalize_routes(routes):
+        """Accept a single path, a list of (path, weight) pairs, or anything else meaning 'unrouted'."""
+        if not isinstance(routes, list) or not routes:
+            return []
+        if isinstance(routes[0], str):
+            return [(routes, 1.0)]
+        # Drop the invalid paths first, so their weight is spread over the valid ones instead of being lost
+        routes = [(path, weight) for path, weight in routes if isinstance(path, list)]
+        total = sum(weight for _, weight in routes)
+        if total <= 0:
+            return []
+        return [(path, weight / total) for path, weight in routes]
+
+    def build_incidence(self, flows, routing):
+        """
+        Build the sparse flow x link incidence of a routing.
+
+        Args:
+            flows (list): (source, dest) pairs.
+            routing: See `simulate`.
+
+        Returns:
+            tuple: (flow_indices, link_indices, fractions, routed), where the first three are parallel arrays
+                   (COO form) and `routed` is a boolean array marking the flows that got at least one path.
+
+        Raises:
+            ValueError: If a path uses a link that is not in the topology.
+        """
+        route = self._route_function(routing)
+        flow_indices, link_indices, fractions = [], [], []
+        routed = np.zeros(len(flows), dtype=bool)
+        for f, (source, dest) in enumerate(flows):
+            for path, fraction in route(source, dest):
+                routed[f] = True
+                for hop in zip(path[:-1], path[1:]):
+                    if hop not in self.link_index:
+                        raise ValueError(f"Path {path} uses unknown link {hop}.")
+                    flow_indices.append(f)
+                    link_indices.append(self.link_index[hop])
+                    fractions.append(fraction)
+        return (np.array(flow_indices, dtype=np.int64), np.array(link_indices, dtype=np.int64),
+                np.array(fractions, dtype=float), routed)
+
+    def simulate(self, traffic_matrix, routing="dijkstra", congestion_threshold=0.9):
+        """
+        Compute link utilization and end-to-end delay/loss estimates for a routing under a traffic matrix.
+
+        Per directed link l with utilization u (offered load / capacity):
+            delay estimate = delay_l / (1 - min(u, 0.99))               (M/M/1-style queueing growth)
+            loss estimate  = 1 - (1 - loss_l) * (1 - max(0, 1 - 1/u))   (link loss plus overload drops)
+        A flow's delay is the fraction-weighted sum over the links it crosses, and its loss combines the
+        link losses multiplicatively (also fraction-weighted for multipath routes).
+
+        Args:
+            traffic_matrix (dict): Mapping of (source, dest) to demand in Mbps.
+            routing: One of:
+                - "dijkstra": delay-weighted shortest path per flow.
+                - "hops": hop-count shortest path per flow.
+                - "ecmp": demand split evenly over all delay-shortest paths.
+                - a dict mapping (source, dest) to a path or to a list of (path, weight) pairs.
+                - a callable (source, dest) -> path or list of (path, weight) pairs, e.g.
+                  `lambda s, d: finder.shortest_path(s, d, verbose=False)`.
+                Flows without a valid path count as unrouted and fully lost.
+            congestion_threshold (float): Utilization at or above which a link is reported as congested.
+
+        Returns:
+            dict: Summary and per-link / per-flow results:
+                "max_link_utilization", "mean_link_utilization", "congested_links" (list of (u, v, utilization),
+                most utilized first), "unrouted_flows", "offered_load", "delivered_load",
+                "mean_flow_delay", "max_flow_delay", "mean_flow_loss", and the arrays "links",
+                "link_load", "link_utilization", "flows", "flow_demand", "flow_delay", "flow_loss".
+        """
+        flows = list(traffic_matrix)
+        demand = np.array([traffic_matrix[flow] for flow in flows], dtype=float)
+        flow_indices, link_indices, fractions, routed = self.build_incidence(flows, routing)
+
+        link_load = np.bincount(link_indices, weights=demand[flow_indices] * fractions, minlength=len(self.links))
+        utilization = np.divide(link_load, self.capacity, out=np.zeros_like(link_load), where=self.capacity > 0)
+
+        link_delay = self.delay / (1 - np.minimum(utilization, MAX_QUEUE_UTILIZATION))
+        overload_drop = np.where(utilization > 1, 1 - 1 / np.maximum(utilization, 1), 0.0)
+        link_survival = (1 - self.loss) * (1 - overload_drop)
+
+        flow_delay = np.bincount(flow_indices, weights=fractions * link_delay[link_indices], minlength=len(flows))
+        # log-survival of each flow: sum over its links, weighted by the fraction of demand on each path
+        log_survival = np.bincount(flow_indices, weights=fractions * np.log(np.maximum(link_survival[link_indices], 1e-12)),
+                                   minlength=len(flows))
+        flow_loss = np.where(routed, 1 - np.exp(log_survival), 1.0)
+        flow_delay = np.where(routed, flow_delay, np.inf)
+
+        order = np.argsort(-utilization)
+        congested = [(self.links[i][0], self.links[i][1], float(utilization[i]))
+                     for i in order if utilization[i] >= congestion_threshold]
+        routed_delay = flow_delay[routed]
+
+        return {
+            "max_link_utilization": float(utilization.max()) if len(utilization) else 0.0,
+            "mean_link_utilization": float(utilization.mean()) if len(utilization) else 0.0,
+            "congested_links": congested,
+            "unrouted_flows": int((~routed).sum()),
+            "offered_load": float(demand.sum()),
+            "delivered_load": float((demand * (1 - flow_loss)).sum()),
+            "mean_flow_delay": float(routed_delay.mean()) if len(routed_delay) else None,
+            "max_flow_delay": float(routed_delay.max()) if len(routed_delay) else None,
+            "mean_flow_loss": float(flow_loss.mean()) if len(flow_loss) else 0.0,
+            "links": self.links,
+            "link_load": link_load,
+            "link_utilization": utilization,
+            "flows": flows,
+            "flow_demand": demand,
+            "flow_delay": flow_delay,
+            "flow_loss": flow_loss,
+        }